@@ -4,21 +4,30 @@ DVCCC Instagram Content Manager - Web Interface
 """
 
 import os
+import re
 import sys
-import json
+import bisect
+import queue
+import random
 import sqlite3
 import logging
+import threading
+from calendar import Calendar, monthrange
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+import requests
+from flask import Flask, render_template, request, jsonify, redirect, url_for, g
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 
+from src.constants import CHANNEL_DESC
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Add src to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 load_dotenv()
 
 # Import components with error handling
@@ -53,12 +62,70 @@ try:
 except ImportError as e:
     logger.warning(f"Could not import scheduler: {e}")
 
+# Optional faster JSON encoder for the larger API payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson.
+
+    Calls with json.dumps keyword arguments (and pretty-printed debug
+    responses) go through the default provider, since orjson has no
+    equivalent for most of them.
+    """
+
+    def _encode(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
+
+
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
+if orjson:
+    app.json = OrjsonProvider(app)
+    app.json.sort_keys = False
 
 # Database setup
 DB_PATH = 'scheduled_posts.db'
 
+# Posts shown per page on the All Posts page
+POSTS_PER_PAGE = 50
+
+# Suggested themes offered on the create, schedule and video pages
+SUGGESTED_THEMES = (
+    "We see you, we believe you, and we are here for you",
+    "Free confidential support available in Chester County",
+    "Your journey to healing starts with one step",
+    "You deserve to feel safe - help is available",
+    "Hope lives here at DVCCC",
+    "Our counselors are here to listen without judgment",
+    "Every survivor has a story of strength",
+    "Building healthy relationships after trauma"
+)
+VIDEO_THEMES = SUGGESTED_THEMES[:5]
+
 # ============== ERROR HANDLING HELPERS ==============
 
 def check_api_keys():
@@ -118,128 +185,344 @@ def parse_openai_error(error):
         }
 
 
+# Bump when _SCHEMA or the migrations in init_db() change; databases already at
+# this version skip schema setup entirely on startup
+SCHEMA_VERSION = 2
+
+_SCHEMA = '''
+    -- Posts table
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        theme TEXT NOT NULL,
+        caption TEXT NOT NULL,
+        image_url TEXT NOT NULL,
+        scheduled_time TEXT,
+        status TEXT DEFAULT 'draft',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        schedule_id INTEGER,
+        FOREIGN KEY (schedule_id) REFERENCES schedules(id) ON DELETE SET NULL
+    );
+
+    -- Schedules table for recurring posts
+    CREATE TABLE IF NOT EXISTS schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        is_active INTEGER DEFAULT 1,
+        theme_mode TEXT DEFAULT 'same',
+        auto_post INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        next_theme_idx INTEGER DEFAULT 0
+    );
+
+    -- Schedule times (multiple times per schedule)
+    CREATE TABLE IF NOT EXISTS schedule_times (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        schedule_id INTEGER NOT NULL,
+        time_of_day TEXT NOT NULL,
+        days_of_week TEXT DEFAULT '0,1,2,3,4,5,6',
+        FOREIGN KEY (schedule_id) REFERENCES schedules(id) ON DELETE CASCADE
+    );
+
+    -- Themes for schedules
+    CREATE TABLE IF NOT EXISTS schedule_themes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        schedule_id INTEGER NOT NULL,
+        theme TEXT NOT NULL,
+        use_order INTEGER DEFAULT 0,
+        FOREIGN KEY (schedule_id) REFERENCES schedules(id) ON DELETE CASCADE
+    );
+
+    -- Pending posts awaiting review
+    CREATE TABLE IF NOT EXISTS pending_posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        schedule_id INTEGER,
+        theme TEXT NOT NULL,
+        caption TEXT NOT NULL,
+        image_url TEXT NOT NULL,
+        scheduled_for TEXT NOT NULL,
+        status TEXT DEFAULT 'pending_review',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (schedule_id) REFERENCES schedules(id) ON DELETE SET NULL
+    );
+
+    -- Indexes for the columns the listing pages filter and sort on
+    CREATE INDEX IF NOT EXISTS idx_posts_status_time ON posts(status, scheduled_time);
+    DROP INDEX IF EXISTS idx_posts_created;
+    CREATE INDEX IF NOT EXISTS idx_posts_created_id ON posts(created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_posts_schedule ON posts(schedule_id);
+    CREATE INDEX IF NOT EXISTS idx_pending_status_for ON pending_posts(status, scheduled_for);
+    CREATE INDEX IF NOT EXISTS idx_sched_times_sid ON schedule_times(schedule_id);
+    CREATE INDEX IF NOT EXISTS idx_sched_themes_sid ON schedule_themes(schedule_id, use_order);
+'''
+
+
+# Child tables of schedules that older databases are rebuilt from; while a rebuild
+# is in progress the original rows sit in a "<table>_old" copy
+_REBUILT_TABLES = ('posts', 'schedule_times', 'schedule_themes', 'pending_posts')
+
+
 def init_db():
     """Initialize the database."""
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
 
-    # Posts table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            theme TEXT NOT NULL,
-            caption TEXT NOT NULL,
-            image_url TEXT NOT NULL,
-            scheduled_time TEXT,
-            status TEXT DEFAULT 'draft',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            schedule_id INTEGER,
-            FOREIGN KEY (schedule_id) REFERENCES schedules(id)
+    # Rows left in "<table>_old" by a rebuild that never finished still have to be
+    # copied back, whatever version the database was stamped with
+    leftover_tables = [
+        name[:-len('_old')] for (name,) in c.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?, ?, ?)",
+            tuple(f'{table}_old' for table in _REBUILT_TABLES)
         )
-    ''')
+    ]
+    if c.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION and not leftover_tables:
+        conn.close()
+        return
+
+    # WAL lets the dashboard keep reading while a post is being written; the
+    # journal mode is stored in the database file, so setting it here is enough.
+    # It can't be changed inside a transaction, so it goes first
+    c.execute('PRAGMA journal_mode=WAL')
+
+    # Everything below is one transaction: if any step fails or the process dies,
+    # the database is left exactly as it was and the next start tries again
+    c.execute('BEGIN IMMEDIATE')
+    try:
+        # Databases created before the schedule foreign keys declared ON DELETE
+        # actions are rebuilt: move the child tables (minus their indexes) aside
+        # so the schema below creates them in the new shape
+        rebuild_tables = [
+            table for table in _REBUILT_TABLES
+            if table not in leftover_tables
+            and any(fk[6] == 'NO ACTION' for fk in c.execute(f'PRAGMA foreign_key_list({table})'))
+        ]
+        for table in rebuild_tables:
+            indexes = c.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            ).fetchall()
+            for (index,) in indexes:
+                c.execute(f'DROP INDEX {index}')
+            c.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+        if rebuild_tables:
+            logger.info("Rebuilding tables to add ON DELETE actions to schedule foreign keys")
+        if leftover_tables:
+            logger.warning(f"Finishing an interrupted table rebuild: {', '.join(leftover_tables)}")
+
+        # executescript() would commit first, so run the schema one statement at a time
+        for statement in _SCHEMA.split(';'):
+            if statement.strip():
+                c.execute(statement)
+
+        # Copy rows out of the pre-rebuild tables, dropping references to schedules
+        # that were deleted before the foreign keys were enforced
+        legacy_tables = leftover_tables + rebuild_tables
+        for table in legacy_tables:
+            columns = [row[1] for row in c.execute(f'PRAGMA table_info({table}_old)')]
+            if c.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone():
+                # Rows were added after an interrupted rebuild; nothing references
+                # these tables' ids, so the old rows take fresh ones
+                columns.remove('id')
+            column_list = ', '.join(columns)
+            c.execute(f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_old')
+            # Keep the AUTOINCREMENT high-water mark so ids of deleted rows aren't reused
+            old_seq = c.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (f'{table}_old',)).fetchone()
+            if old_seq:
+                c.execute('UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?', (old_seq[0], table))
+                if not c.rowcount:
+                    c.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, old_seq[0]))
+            c.execute(f'DROP TABLE {table}_old')
+        if legacy_tables:
+            c.execute('UPDATE posts SET schedule_id = NULL WHERE schedule_id NOT IN (SELECT id FROM schedules)')
+            c.execute('UPDATE pending_posts SET schedule_id = NULL WHERE schedule_id NOT IN (SELECT id FROM schedules)')
+            c.execute('DELETE FROM schedule_times WHERE schedule_id NOT IN (SELECT id FROM schedules)')
+            c.execute('DELETE FROM schedule_themes WHERE schedule_id NOT IN (SELECT id FROM schedules)')
+
+        # Theme rotation cursor for 'different' mode schedules; older databases start
+        # it where the previous count-of-posts rotation had got to (posts plus
+        # posts still pending review)
+        if 'next_theme_idx' not in [row[1] for row in c.execute('PRAGMA table_info(schedules)')]:
+            c.execute('ALTER TABLE schedules ADD COLUMN next_theme_idx INTEGER DEFAULT 0')
+            c.execute('''
+                UPDATE schedules SET next_theme_idx =
+                    (SELECT COUNT(*) FROM posts WHERE posts.schedule_id = schedules.id)
+                    + (SELECT COUNT(*) FROM pending_posts WHERE pending_posts.schedule_id = schedules.id)
+            ''')
+
+        c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    except BaseException:
+        conn.rollback()
+        conn.close()
+        raise
+    conn.commit()
+    conn.close()
 
-    # Schedules table for recurring posts
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS schedules (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            is_active INTEGER DEFAULT 1,
-            theme_mode TEXT DEFAULT 'same',
-            auto_post INTEGER DEFAULT 0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
 
-    # Schedule times (multiple times per schedule)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS schedule_times (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            schedule_id INTEGER NOT NULL,
-            time_of_day TEXT NOT NULL,
-            days_of_week TEXT DEFAULT '0,1,2,3,4,5,6',
-            FOREIGN KEY (schedule_id) REFERENCES schedules(id)
-        )
-    ''')
+# UPDATE ... RETURNING needs SQLite 3.35+; older libraries re-read the row instead
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Idle connections kept for reuse across requests: one per gthread request thread.
+# GUNICORN_THREADS is also what gunicorn.conf.py uses for the thread count
+DB_POOL_SIZE = int(os.getenv('GUNICORN_THREADS', '8'))
+_db_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+def _connect_db():
+    """Open a new database connection."""
+    # Pooled connections live across requests, so a larger prepared-statement
+    # cache keeps every route's queries parsed after the first hit
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    # Foreign keys are off by default in SQLite; schedule deletes rely on them cascading
+    conn.execute('PRAGMA foreign_keys=ON')
+    # Per-connection settings: fewer fsyncs under WAL, wait on locks instead of failing,
+    # and a 32 MB page cache
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA cache_size=-32000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
 
-    # Themes for schedules
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS schedule_themes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            schedule_id INTEGER NOT NULL,
-            theme TEXT NOT NULL,
-            use_order INTEGER DEFAULT 0,
-            FOREIGN KEY (schedule_id) REFERENCES schedules(id)
-        )
-    ''')
 
-    # Pending posts awaiting review
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS pending_posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            schedule_id INTEGER,
-            theme TEXT NOT NULL,
-            caption TEXT NOT NULL,
-            image_url TEXT NOT NULL,
-            scheduled_for TEXT NOT NULL,
-            status TEXT DEFAULT 'pending_review',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (schedule_id) REFERENCES schedules(id)
-        )
-    ''')
+def get_db(rows=True):
+    """Get the database connection for the current request.
 
-    conn.commit()
-    conn.close()
+    Cursors return sqlite3.Row by default; rows=False gives plain tuples for
+    handlers that only read columns by position.
+    """
+    if 'db' not in g:
+        try:
+            g.db = _db_pool.get_nowait()
+        except queue.Empty:
+            g.db = _connect_db()
+    g.db.row_factory = sqlite3.Row if rows else None
+    return g.db
+
+
+@app.teardown_appcontext
+def release_db(exception):
+    """Return the request's database connection to the pool."""
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
 
 
-def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Serializes writers within the process: threads queue on this lock instead of
+# spinning in SQLite's sleep-and-retry busy handler for the database write lock
+WRITE_LOCK = threading.Lock()
+
 
+@contextmanager
+def db_write():
+    """Run the enclosed statements as one write transaction; yields a cursor.
 
-# Initialize components with error handling
+    Commits on normal exit (including an early return) and rolls back if the
+    block raises.
+    """
+    conn = get_db()
+    with WRITE_LOCK:
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        try:
+            yield c
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+# Components are created on the first request rather than at import, so
+# importing the app (worker boot, CLI commands) doesn't build the OpenAI clients
 text_gen = None
 img_gen = None
 reach_amplify = None
 uploader = None
 initialization_errors = []
+_components_ready = False
+_components_lock = threading.Lock()
 
-logger.info("Starting component initialization...")
 
-try:
-    if TextGenerator and ImageGenerator and os.getenv('OPENAI_API_KEY'):
-        text_gen = TextGenerator(
-            niche='domestic violence awareness',
-            style='warm, personal, and empowering',
-            hashtag_count=10
-        )
-        img_gen = ImageGenerator(output_dir='generated_images')
-        logger.info("AI generators initialized successfully")
-
-        # Initialize REACH Amplify for discovery optimization
-        if ReachAmplify:
-            reach_amplify = ReachAmplify(os.getenv('OPENAI_API_KEY'))
-            logger.info("REACH Amplify initialized successfully")
-    elif not os.getenv('OPENAI_API_KEY'):
-        initialization_errors.append('OPENAI_API_KEY not configured - content generation disabled')
-        logger.warning('OPENAI_API_KEY not configured')
-    else:
-        initialization_errors.append('Content generator modules not available')
-        logger.warning('Content generator modules not available')
-except Exception as e:
-    initialization_errors.append(f'Failed to initialize AI generators: {str(e)}')
-    logger.error(f'Failed to initialize AI generators: {e}')
+def init_components():
+    """Initialize the AI generators and image uploader, once per process."""
+    global text_gen, img_gen, reach_amplify, uploader, _components_ready
 
-try:
-    if get_uploader:
-        uploader = get_uploader()
-        logger.info("Image uploader initialized successfully")
-except Exception as e:
-    initialization_errors.append(f'Image hosting not configured: {str(e)}')
-    logger.warning(f'Image hosting not configured: {e}')
+    with _components_lock:
+        if _components_ready:
+            return
 
-logger.info(f"Initialization complete. Errors: {initialization_errors if initialization_errors else 'None'}")
+        logger.info("Starting component initialization...")
+
+        try:
+            if TextGenerator and ImageGenerator and os.getenv('OPENAI_API_KEY'):
+                text_gen = TextGenerator(
+                    niche='domestic violence awareness',
+                    style='warm, personal, and empowering',
+                    hashtag_count=10
+                )
+                img_gen = ImageGenerator(output_dir='generated_images')
+                logger.info("AI generators initialized successfully")
+
+                # Initialize REACH Amplify for discovery optimization
+                if ReachAmplify:
+                    reach_amplify = ReachAmplify(os.getenv('OPENAI_API_KEY'))
+                    logger.info("REACH Amplify initialized successfully")
+            elif not os.getenv('OPENAI_API_KEY'):
+                initialization_errors.append('OPENAI_API_KEY not configured - content generation disabled')
+                logger.warning('OPENAI_API_KEY not configured')
+            else:
+                initialization_errors.append('Content generator modules not available')
+                logger.warning('Content generator modules not available')
+        except Exception as e:
+            initialization_errors.append(f'Failed to initialize AI generators: {str(e)}')
+            logger.error(f'Failed to initialize AI generators: {e}')
+
+        try:
+            if get_uploader:
+                uploader = get_uploader()
+                logger.info("Image uploader initialized successfully")
+        except Exception as e:
+            initialization_errors.append(f'Image hosting not configured: {str(e)}')
+            logger.warning(f'Image hosting not configured: {e}')
+
+        logger.info(f"Initialization complete. Errors: {initialization_errors if initialization_errors else 'None'}")
+        _components_ready = True
+
+
+@app.before_request
+def ensure_components():
+    """Initialize components before the first request is handled."""
+    if not _components_ready:
+        init_components()
+
+
+# Shared workers for the image pipeline, so a generate request doesn't start its own threads
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='image-pipeline')
+
+# Upper bound on waiting for a pipeline (DALL-E allows 180s, plus download and upload);
+# kept under gunicorn's --timeout 300 so a stuck call fails the request cleanly
+GENERATION_TIMEOUT = 240
+
+
+def generate_hosted_image(theme, use_cache=False):
+    """Run the image pipeline for a theme: prompt, DALL-E, Instagram resize, upload.
+
+    Returns (prompt, image_url). Independent of the caption text, so /generate
+    runs it on a worker thread while the caption is translated. use_cache lets
+    the prompt reuse a cached GPT-4 scene; regenerate and slideshow callers
+    leave it off so each image gets its own.
+    """
+    prompt = text_gen.generate_image_prompt(theme, use_cache=use_cache)
+    # Without a hosting service the DALL-E URL is used as-is, so the
+    # Instagram-sized copy is only produced when it will be uploaded
+    img_result = img_gen.generate_image(prompt, size='1024x1024', style='natural',
+                                        for_instagram=bool(uploader))
+    if not uploader:
+        return prompt, img_result['image_url']
+    return prompt, uploader.upload(img_result['image_path'])
 
 
 @app.route('/health')
@@ -266,26 +549,22 @@ def dashboard():
     conn = get_db()
     c = conn.cursor()
 
-    # Get stats
-    c.execute('SELECT COUNT(*) as cnt FROM posts')
-    total_posts = c.fetchone()['cnt']
-
-    c.execute('SELECT COUNT(*) as cnt FROM posts WHERE status = "scheduled"')
-    scheduled_posts = c.fetchone()['cnt']
-
-    c.execute('SELECT COUNT(*) as cnt FROM posts WHERE status = "draft"')
-    draft_posts = c.fetchone()['cnt']
-
-    c.execute('SELECT COUNT(*) as cnt FROM pending_posts WHERE status = "pending_review"')
-    pending_count = c.fetchone()['cnt']
-
-    c.execute('SELECT COUNT(*) as cnt FROM schedules WHERE is_active = 1')
-    active_schedules = c.fetchone()['cnt']
+    # Get stats - one pass over posts, then the pending and schedule counts together.
+    # created_at is stored in UTC by CURRENT_TIMESTAMP, so the week cutoff is too
+    c.execute('''
+        SELECT COUNT(*),
+               COUNT(CASE WHEN status = 'scheduled' THEN 1 END),
+               COUNT(CASE WHEN status = 'draft' THEN 1 END),
+               COUNT(CASE WHEN created_at >= datetime('now', '-7 days') THEN 1 END)
+        FROM posts
+    ''')
+    total_posts, scheduled_posts, draft_posts, posts_this_week = c.fetchone()
 
-    # Posts this week
-    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    c.execute('SELECT COUNT(*) as cnt FROM posts WHERE created_at >= ?', (week_ago,))
-    posts_this_week = c.fetchone()['cnt']
+    c.execute('''
+        SELECT (SELECT COUNT(*) FROM pending_posts WHERE status = 'pending_review'),
+               (SELECT COUNT(*) FROM schedules WHERE is_active = 1)
+    ''')
+    pending_count, active_schedules = c.fetchone()
 
     # Recent posts
     c.execute('SELECT * FROM posts ORDER BY created_at DESC LIMIT 5')
@@ -299,8 +578,6 @@ def dashboard():
     ''')
     upcoming = c.fetchall()
 
-    conn.close()
-
     # Check configuration status
     config_issues = check_api_keys() + initialization_errors
     generators_ready = text_gen is not None and img_gen is not None
@@ -322,54 +599,36 @@ def dashboard():
 @app.route('/create')
 def create_post():
     """Create new content page."""
-    # Suggested themes
-    themes = [
-        "We see you, we believe you, and we are here for you",
-        "Free confidential support available in Chester County",
-        "Your journey to healing starts with one step",
-        "You deserve to feel safe - help is available",
-        "Hope lives here at DVCCC",
-        "Our counselors are here to listen without judgment",
-        "Every survivor has a story of strength",
-        "Building healthy relationships after trauma"
-    ]
-    return render_template('index.html', themes=themes)
+    return render_template('index.html', themes=SUGGESTED_THEMES)
 
 
 @app.route('/calendar')
 def calendar():
     """Calendar view of scheduled posts."""
-    conn = get_db()
+    conn = get_db(rows=False)
     c = conn.cursor()
 
-    # Get all scheduled and posted items for calendar
+    # Get all scheduled and posted items for calendar, with titles cut to 30 characters
     c.execute('''
-        SELECT id, theme, caption, image_url, scheduled_time, status, 'post' as type
+        SELECT id, CASE WHEN length(theme) > 30 THEN substr(theme, 1, 30) || '...' ELSE theme END,
+               scheduled_time, status, 'post' as type, image_url
         FROM posts
         WHERE scheduled_time IS NOT NULL AND scheduled_time != ''
         UNION ALL
-        SELECT id, theme, caption, image_url, scheduled_for as scheduled_time, status, 'pending' as type
+        SELECT id, CASE WHEN length(theme) > 30 THEN substr(theme, 1, 30) || '...' ELSE theme END,
+               scheduled_for as scheduled_time, status, 'pending' as type, image_url
         FROM pending_posts
         WHERE status = 'pending_review'
         ORDER BY scheduled_time
     ''')
-    events = c.fetchall()
-
-    conn.close()
 
     # Convert to calendar format
-    calendar_events = []
-    for event in events:
-        calendar_events.append({
-            'id': event['id'],
-            'title': event['theme'][:30] + '...' if len(event['theme']) > 30 else event['theme'],
-            'start': event['scheduled_time'],
-            'status': event['status'],
-            'type': event['type'],
-            'image_url': event['image_url']
-        })
+    calendar_events = [
+        {'id': row[0], 'title': row[1], 'start': row[2], 'status': row[3], 'type': row[4], 'image_url': row[5]}
+        for row in c.fetchall()
+    ]
 
-    return render_template('calendar.html', events=json.dumps(calendar_events))
+    return render_template('calendar.html', events=app.json.dumps(calendar_events))
 
 
 @app.route('/generate', methods=['POST'])
@@ -392,14 +651,14 @@ def generate():
         }), 503
 
     try:
-        # Generate caption
-        channel_desc = '''We are the Domestic Violence Center of Chester County (DVCCC),
-        providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of domestic violence
-        in Chester County, PA.'''
-
-        result = text_gen.generate_caption(theme, channel_description=channel_desc)
+        result = text_gen.generate_caption(theme, channel_description=CHANNEL_DESC)
         caption = result['caption']
 
+        # Start the image only once the caption has succeeded, so a failed
+        # request never pays for a DALL-E call and upload; it runs in the
+        # background while the caption is translated
+        image_future = EXECUTOR.submit(generate_hosted_image, theme, use_cache=True)
+
         # Translate to Spanish if requested
         spanish_caption = None
         if language == 'es' and reach_amplify:
@@ -412,16 +671,7 @@ def generate():
             except Exception as e:
                 logger.warning(f"Spanish translation failed: {e}")
 
-        # Generate image
-        prompt = text_gen.generate_image_prompt(theme)
-        img_result = img_gen.generate_image(prompt, size='1024x1024', style='natural')
-        optimized = img_gen.optimize_for_instagram(img_result['image_path'])
-
-        # Upload to hosting
-        if uploader:
-            image_url = uploader.upload(optimized)
-        else:
-            image_url = img_result['image_url']
+        prompt, image_url = image_future.result(timeout=GENERATION_TIMEOUT)
 
         # REACH Amplify - AI-powered discovery & SEO optimization
         discovery_data = None
@@ -479,29 +729,34 @@ def save_post():
     scheduled_time = data.get('scheduled_time', '')
     status = 'scheduled' if scheduled_time else 'draft'
 
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO posts (theme, caption, image_url, scheduled_time, status)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (theme, caption, image_url, scheduled_time, status))
-    conn.commit()
-    post_id = c.lastrowid
-    conn.close()
+    with db_write() as c:
+        c.execute('''
+            INSERT INTO posts (theme, caption, image_url, scheduled_time, status)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (theme, caption, image_url, scheduled_time, status))
+        post_id = c.lastrowid
 
     return jsonify({'success': True, 'post_id': post_id, 'status': status})
 
 
 @app.route('/posts')
 def posts():
-    """View all posts."""
+    """View all posts, one page at a time."""
+    page = max(1, request.args.get('page', 1, type=int))
     conn = get_db()
     c = conn.cursor()
-    c.execute('SELECT * FROM posts ORDER BY created_at DESC')
-    all_posts = c.fetchall()
-    conn.close()
+    # Captions are only previewed (100 chars) on this page; fetch one extra
+    # row to know whether there is a next page without a COUNT(*)
+    c.execute('''
+        SELECT id, theme, substr(caption, 1, 101) AS caption, image_url,
+               scheduled_time, status, created_at
+        FROM posts ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+    ''', (POSTS_PER_PAGE + 1, (page - 1) * POSTS_PER_PAGE))
+    page_posts = c.fetchall()
+    has_next = len(page_posts) > POSTS_PER_PAGE
 
-    return render_template('posts.html', posts=all_posts)
+    return render_template('posts.html', posts=page_posts[:POSTS_PER_PAGE],
+                           page=page, has_next=has_next)
 
 
 @app.route('/post/<int:post_id>')
@@ -511,7 +766,6 @@ def view_post(post_id):
     c = conn.cursor()
     c.execute('SELECT * FROM posts WHERE id = ?', (post_id,))
     post = c.fetchone()
-    conn.close()
 
     if not post:
         return "Post not found", 404
@@ -522,11 +776,8 @@ def view_post(post_id):
 @app.route('/post/<int:post_id>/delete', methods=['POST'])
 def delete_post(post_id):
     """Delete a post."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('DELETE FROM posts WHERE id = ?', (post_id,))
-    conn.commit()
-    conn.close()
+    with db_write() as c:
+        c.execute('DELETE FROM posts WHERE id = ?', (post_id,))
 
     return redirect(url_for('posts'))
 
@@ -536,17 +787,20 @@ def copy_post(post_id):
     """Get post data for copying."""
     conn = get_db()
     c = conn.cursor()
-    c.execute('SELECT * FROM posts WHERE id = ?', (post_id,))
+    c.execute('SELECT caption, image_url FROM posts WHERE id = ?', (post_id,))
     post = c.fetchone()
-    conn.close()
 
     if not post:
         return jsonify({'error': 'Post not found'}), 404
 
-    return jsonify({
+    # Saved posts are never edited, so the browser can reuse this for a while
+    response = jsonify({
         'caption': post['caption'],
         'image_url': post['image_url']
     })
+    response.headers['Cache-Control'] = 'private, max-age=3600'
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 # ============== SCHEDULE MANAGEMENT ==============
@@ -557,45 +811,37 @@ def schedules():
     conn = get_db()
     c = conn.cursor()
 
-    # Get all schedules with their times and themes
+    # Get all schedules, then their times and themes in one query each
     c.execute('SELECT * FROM schedules ORDER BY created_at DESC')
     all_schedules = c.fetchall()
 
-    schedules_data = []
-    for schedule in all_schedules:
-        # Get times for this schedule
-        c.execute('SELECT * FROM schedule_times WHERE schedule_id = ?', (schedule['id'],))
-        times = c.fetchall()
+    times_by_schedule = defaultdict(list)
+    themes_by_schedule = defaultdict(list)
+    if all_schedules:
+        ids = [schedule['id'] for schedule in all_schedules]
+        placeholders = ','.join('?' * len(ids))
 
-        # Get themes for this schedule
-        c.execute('SELECT * FROM schedule_themes WHERE schedule_id = ? ORDER BY use_order', (schedule['id'],))
-        themes = c.fetchall()
+        c.execute(f'SELECT * FROM schedule_times WHERE schedule_id IN ({placeholders}) ORDER BY id', ids)
+        for row in c.fetchall():
+            times_by_schedule[row['schedule_id']].append(row)
 
-        schedules_data.append({
-            'schedule': schedule,
-            'times': times,
-            'themes': themes
-        })
+        c.execute(f'SELECT * FROM schedule_themes WHERE schedule_id IN ({placeholders}) ORDER BY use_order', ids)
+        for row in c.fetchall():
+            themes_by_schedule[row['schedule_id']].append(row)
+
+    schedules_data = [{
+        'schedule': schedule,
+        'times': times_by_schedule[schedule['id']],
+        'themes': themes_by_schedule[schedule['id']]
+    } for schedule in all_schedules]
 
-    conn.close()
     return render_template('schedules.html', schedules=schedules_data)
 
 
 @app.route('/schedule/new')
 def new_schedule():
     """Create a new schedule page."""
-    # Suggested themes
-    suggested_themes = [
-        "We see you, we believe you, and we are here for you",
-        "Free confidential support available in Chester County",
-        "Your journey to healing starts with one step",
-        "You deserve to feel safe - help is available",
-        "Hope lives here at DVCCC",
-        "Our counselors are here to listen without judgment",
-        "Every survivor has a story of strength",
-        "Building healthy relationships after trauma"
-    ]
-    return render_template('schedule_form.html', schedule=None, suggested_themes=suggested_themes)
+    return render_template('schedule_form.html', schedule=None, suggested_themes=SUGGESTED_THEMES)
 
 
 @app.route('/schedule/create', methods=['POST'])
@@ -609,34 +855,26 @@ def create_schedule():
     times = data.get('times', [])  # List of {time, days}
     themes = data.get('themes', [])  # List of theme strings
 
-    conn = get_db()
-    c = conn.cursor()
-
-    # Create schedule
-    c.execute('''
-        INSERT INTO schedules (name, theme_mode, auto_post)
-        VALUES (?, ?, ?)
-    ''', (name, theme_mode, auto_post))
-    schedule_id = c.lastrowid
-
-    # Add times
-    for t in times:
-        time_of_day = t.get('time', '09:00')
-        days = t.get('days', '0,1,2,3,4,5,6')
+    # One transaction, so the schedule and its rows change together
+    with db_write() as c:
+        # Create schedule
         c.execute('''
+            INSERT INTO schedules (name, theme_mode, auto_post)
+            VALUES (?, ?, ?)
+        ''', (name, theme_mode, auto_post))
+        schedule_id = c.lastrowid
+
+        # Add times
+        c.executemany('''
             INSERT INTO schedule_times (schedule_id, time_of_day, days_of_week)
             VALUES (?, ?, ?)
-        ''', (schedule_id, time_of_day, days))
+        ''', [(schedule_id, t.get('time', '09:00'), t.get('days', '0,1,2,3,4,5,6')) for t in times])
 
-    # Add themes
-    for i, theme in enumerate(themes):
-        c.execute('''
+        # Add themes
+        c.executemany('''
             INSERT INTO schedule_themes (schedule_id, theme, use_order)
             VALUES (?, ?, ?)
-        ''', (schedule_id, theme, i))
-
-    conn.commit()
-    conn.close()
+        ''', [(schedule_id, theme, i) for i, theme in enumerate(themes)])
 
     return jsonify({'success': True, 'schedule_id': schedule_id})
 
@@ -653,30 +891,24 @@ def view_schedule(schedule_id):
     if not schedule:
         return "Schedule not found", 404
 
-    c.execute('SELECT * FROM schedule_times WHERE schedule_id = ?', (schedule_id,))
-    times = c.fetchall()
-
-    c.execute('SELECT * FROM schedule_themes WHERE schedule_id = ? ORDER BY use_order', (schedule_id,))
-    themes = c.fetchall()
-
-    conn.close()
-
-    suggested_themes = [
-        "We see you, we believe you, and we are here for you",
-        "Free confidential support available in Chester County",
-        "Your journey to healing starts with one step",
-        "You deserve to feel safe - help is available",
-        "Hope lives here at DVCCC",
-        "Our counselors are here to listen without judgment",
-        "Every survivor has a story of strength",
-        "Building healthy relationships after trauma"
-    ]
+    # Times and themes in one query, tagged by kind; times keep insertion order
+    c.execute('''
+        SELECT 'time' AS kind, id, time_of_day, days_of_week, NULL AS theme, 0 AS use_order
+        FROM schedule_times WHERE schedule_id = ?
+        UNION ALL
+        SELECT 'theme', id, NULL, NULL, theme, use_order
+        FROM schedule_themes WHERE schedule_id = ?
+        ORDER BY kind, use_order, id
+    ''', (schedule_id, schedule_id))
+    times, themes = [], []
+    for row in c.fetchall():
+        (times if row['kind'] == 'time' else themes).append(row)
 
     return render_template('schedule_form.html',
                          schedule=schedule,
                          times=times,
                          themes=themes,
-                         suggested_themes=suggested_themes)
+                         suggested_themes=SUGGESTED_THEMES)
 
 
 @app.route('/schedule/<int:schedule_id>/update', methods=['POST'])
@@ -691,37 +923,29 @@ def update_schedule(schedule_id):
     times = data.get('times', [])
     themes = data.get('themes', [])
 
-    conn = get_db()
-    c = conn.cursor()
-
-    # Update schedule
-    c.execute('''
-        UPDATE schedules SET name=?, theme_mode=?, auto_post=?, is_active=?
-        WHERE id=?
-    ''', (name, theme_mode, auto_post, is_active, schedule_id))
-
-    # Delete old times and themes
-    c.execute('DELETE FROM schedule_times WHERE schedule_id = ?', (schedule_id,))
-    c.execute('DELETE FROM schedule_themes WHERE schedule_id = ?', (schedule_id,))
-
-    # Add new times
-    for t in times:
-        time_of_day = t.get('time', '09:00')
-        days = t.get('days', '0,1,2,3,4,5,6')
+    # One transaction, so the schedule and its rows change together
+    with db_write() as c:
+        # Update schedule
         c.execute('''
+            UPDATE schedules SET name=?, theme_mode=?, auto_post=?, is_active=?
+            WHERE id=?
+        ''', (name, theme_mode, auto_post, is_active, schedule_id))
+
+        # Delete old times and themes
+        c.execute('DELETE FROM schedule_times WHERE schedule_id = ?', (schedule_id,))
+        c.execute('DELETE FROM schedule_themes WHERE schedule_id = ?', (schedule_id,))
+
+        # Add new times
+        c.executemany('''
             INSERT INTO schedule_times (schedule_id, time_of_day, days_of_week)
             VALUES (?, ?, ?)
-        ''', (schedule_id, time_of_day, days))
+        ''', [(schedule_id, t.get('time', '09:00'), t.get('days', '0,1,2,3,4,5,6')) for t in times])
 
-    # Add new themes
-    for i, theme in enumerate(themes):
-        c.execute('''
+        # Add new themes
+        c.executemany('''
             INSERT INTO schedule_themes (schedule_id, theme, use_order)
             VALUES (?, ?, ?)
-        ''', (schedule_id, theme, i))
-
-    conn.commit()
-    conn.close()
+        ''', [(schedule_id, theme, i) for i, theme in enumerate(themes)])
 
     return jsonify({'success': True})
 
@@ -729,13 +953,9 @@ def update_schedule(schedule_id):
 @app.route('/schedule/<int:schedule_id>/delete', methods=['POST'])
 def delete_schedule(schedule_id):
     """Delete a schedule."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('DELETE FROM schedule_times WHERE schedule_id = ?', (schedule_id,))
-    c.execute('DELETE FROM schedule_themes WHERE schedule_id = ?', (schedule_id,))
-    c.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
-    conn.commit()
-    conn.close()
+    # Times and themes are removed by ON DELETE CASCADE
+    with db_write() as c:
+        c.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
 
     return redirect(url_for('schedules'))
 
@@ -743,13 +963,18 @@ def delete_schedule(schedule_id):
 @app.route('/schedule/<int:schedule_id>/toggle', methods=['POST'])
 def toggle_schedule(schedule_id):
     """Toggle a schedule active/inactive."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('UPDATE schedules SET is_active = NOT is_active WHERE id = ?', (schedule_id,))
-    conn.commit()
-    conn.close()
+    with db_write() as c:
+        if SQLITE_HAS_RETURNING:
+            c.execute('UPDATE schedules SET is_active = NOT is_active WHERE id = ? RETURNING is_active', (schedule_id,))
+            row = c.fetchone()
+        else:
+            c.execute('UPDATE schedules SET is_active = NOT is_active WHERE id = ?', (schedule_id,))
+            row = c.execute('SELECT is_active FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
 
-    return jsonify({'success': True})
+    if not row:
+        return jsonify({'error': 'Schedule not found'}), 404
+
+    return jsonify({'success': True, 'is_active': bool(row[0])})
 
 
 # ============== PENDING POSTS (for review) ==============
@@ -767,45 +992,40 @@ def pending_posts():
         ORDER BY p.scheduled_for ASC
     ''')
     posts = c.fetchall()
-    conn.close()
 
-    return render_template('pending.html', posts=posts)
+    # Pending posts change on approve/reject/edit, so always revalidate; an
+    # unchanged page is answered with 304 and no body
+    response = app.make_response(render_template('pending.html', posts=posts))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @app.route('/pending/<int:post_id>/approve', methods=['POST'])
 def approve_pending(post_id):
     """Approve a pending post."""
-    conn = get_db()
-    c = conn.cursor()
-
-    # Get the pending post
-    c.execute('SELECT * FROM pending_posts WHERE id = ?', (post_id,))
-    pending = c.fetchone()
-
-    if pending:
-        # Move to main posts table
+    # Copy the row into posts and mark it approved in one transaction; the status
+    # check keeps a repeated approve from scheduling the post twice
+    with db_write() as c:
         c.execute('''
             INSERT INTO posts (theme, caption, image_url, scheduled_time, status, schedule_id)
-            VALUES (?, ?, ?, ?, 'scheduled', ?)
-        ''', (pending['theme'], pending['caption'], pending['image_url'],
-              pending['scheduled_for'], pending['schedule_id']))
+            SELECT theme, caption, image_url, scheduled_for, 'scheduled', schedule_id
+            FROM pending_posts WHERE id = ? AND status = 'pending_review'
+        ''', (post_id,))
+        if c.rowcount == 0:
+            return jsonify({'error': 'Pending post not found'}), 404
 
         # Update pending status
-        c.execute('UPDATE pending_posts SET status = "approved" WHERE id = ?', (post_id,))
-        conn.commit()
+        c.execute("UPDATE pending_posts SET status = 'approved' WHERE id = ?", (post_id,))
 
-    conn.close()
     return jsonify({'success': True})
 
 
 @app.route('/pending/<int:post_id>/reject', methods=['POST'])
 def reject_pending(post_id):
     """Reject a pending post."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('UPDATE pending_posts SET status = "rejected" WHERE id = ?', (post_id,))
-    conn.commit()
-    conn.close()
+    with db_write() as c:
+        c.execute("UPDATE pending_posts SET status = 'rejected' WHERE id = ?", (post_id,))
 
     return jsonify({'success': True})
 
@@ -816,11 +1036,8 @@ def edit_pending(post_id):
     data = request.json
     caption = data.get('caption', '')
 
-    conn = get_db()
-    c = conn.cursor()
-    c.execute('UPDATE pending_posts SET caption = ? WHERE id = ?', (caption, post_id))
-    conn.commit()
-    conn.close()
+    with db_write() as c:
+        c.execute('UPDATE pending_posts SET caption = ? WHERE id = ?', (caption, post_id))
 
     return jsonify({'success': True})
 
@@ -845,21 +1062,6 @@ def generate_for_schedule(schedule_id):
     if not themes:
         return jsonify({'error': 'No themes configured for this schedule'}), 400
 
-    # Pick theme based on mode
-    import random
-    theme_mode = schedule['theme_mode']
-    if theme_mode == 'same':
-        theme = themes[0]
-    elif theme_mode == 'different':
-        # Rotate through themes sequentially
-        c.execute('SELECT COUNT(*) as cnt FROM posts WHERE schedule_id = ?', (schedule_id,))
-        count = c.fetchone()['cnt']
-        theme = themes[count % len(themes)]
-    else:  # mixed
-        theme = random.choice(themes)
-
-    conn.close()
-
     # Check if generators are available
     if not text_gen or not img_gen:
         api_issues = check_api_keys()
@@ -870,25 +1072,32 @@ def generate_for_schedule(schedule_id):
             'action': 'Please configure the OPENAI_API_KEY environment variable.'
         }), 503
 
-    try:
-        # Generate caption
-        channel_desc = '''We are the Domestic Violence Center of Chester County (DVCCC),
-        providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of domestic violence
-        in Chester County, PA.'''
-
-        result = text_gen.generate_caption(theme, channel_description=channel_desc)
-        caption = result['caption']
-
-        # Generate image
-        prompt = text_gen.generate_image_prompt(theme)
-        img_result = img_gen.generate_image(prompt, size='1024x1024', style='natural')
-        optimized = img_gen.optimize_for_instagram(img_result['image_path'])
+    # Pick theme based on mode
+    theme_mode = schedule['theme_mode']
+    if theme_mode == 'same':
+        theme = themes[0]
+    elif theme_mode == 'different':
+        # Rotate through themes sequentially; the cursor only moves once
+        # generation has succeeded (below)
+        cursor = schedule['next_theme_idx']
+        theme = themes[cursor % len(themes)]
+    else:  # mixed
+        theme = random.choice(themes)
 
-        # Upload to hosting
-        if uploader:
-            image_url = uploader.upload(optimized)
-        else:
-            image_url = img_result['image_url']
+    try:
+        # Caption first: it is the cheap call, so a failure here never pays
+        # for a DALL-E call and upload. Nothing else is left to overlap with the
+        # image, so it runs right here rather than on EXECUTOR
+        caption = text_gen.generate_caption(theme, channel_description=CHANNEL_DESC)['caption']
+        _, image_url = generate_hosted_image(theme)
+
+        if theme_mode == 'different':
+            # Move to the next theme, unless a concurrent generation already did
+            with db_write() as c:
+                c.execute('''
+                    UPDATE schedules SET next_theme_idx = ?
+                    WHERE id = ? AND next_theme_idx = ?
+                ''', ((cursor + 1) % len(themes), schedule_id, cursor))
 
         return jsonify({
             'success': True,
@@ -926,11 +1135,7 @@ def regenerate_caption():
         }), 503
 
     try:
-        channel_desc = '''We are the Domestic Violence Center of Chester County (DVCCC),
-        providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of domestic violence
-        in Chester County, PA.'''
-
-        result = text_gen.generate_caption(theme, channel_description=channel_desc)
+        result = text_gen.generate_caption(theme, channel_description=CHANNEL_DESC)
         caption = result['caption']
         spanish_caption = None
 
@@ -978,14 +1183,7 @@ def regenerate_image():
         }), 503
 
     try:
-        prompt = text_gen.generate_image_prompt(theme)
-        img_result = img_gen.generate_image(prompt, size='1024x1024', style='natural')
-        optimized = img_gen.optimize_for_instagram(img_result['image_path'])
-
-        if uploader:
-            image_url = uploader.upload(optimized)
-        else:
-            image_url = img_result['image_url']
+        image_url = generate_hosted_image(theme)[1]
 
         return jsonify({
             'success': True,
@@ -1006,14 +1204,7 @@ def regenerate_image():
 @app.route('/video')
 def video_page():
     """Video generation page."""
-    themes = [
-        "We see you, we believe you, and we are here for you",
-        "Free confidential support available in Chester County",
-        "Your journey to healing starts with one step",
-        "You deserve to feel safe - help is available",
-        "Hope lives here at DVCCC"
-    ]
-    return render_template('video.html', themes=themes)
+    return render_template('video.html', themes=VIDEO_THEMES)
 
 
 @app.route('/generate/video', methods=['POST'])
@@ -1035,26 +1226,13 @@ def generate_video():
 
     try:
         # Generate caption for the video
-        channel_desc = '''We are the Domestic Violence Center of Chester County (DVCCC),
-        providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of domestic violence
-        in Chester County, PA.'''
-
-        result = text_gen.generate_caption(theme, channel_description=channel_desc)
+        result = text_gen.generate_caption(theme, channel_description=CHANNEL_DESC)
         caption = result['caption']
 
         if video_type == 'slideshow':
-            # Generate multiple images for slideshow
-            images = []
-            for i in range(3):  # Generate 3 images
-                prompt = text_gen.generate_image_prompt(theme)
-                img_result = img_gen.generate_image(prompt, size='1024x1024', style='natural')
-                optimized = img_gen.optimize_for_instagram(img_result['image_path'])
-
-                if uploader:
-                    image_url = uploader.upload(optimized)
-                else:
-                    image_url = img_result['image_url']
-                images.append(image_url)
+            # Generate the 3 slideshow images concurrently - each one is independent API and upload I/O
+            slides = [EXECUTOR.submit(generate_hosted_image, theme) for _ in range(3)]
+            images = [slide.result(timeout=GENERATION_TIMEOUT)[1] for slide in slides]
 
             return jsonify({
                 'success': True,
@@ -1094,7 +1272,7 @@ def generate_video():
 @app.route('/api/calendar/events')
 def api_calendar_events():
     """API endpoint for calendar events."""
-    conn = get_db()
+    conn = get_db(rows=False)
     c = conn.cursor()
 
     c.execute('''
@@ -1106,10 +1284,12 @@ def api_calendar_events():
         FROM pending_posts
         WHERE status = 'pending_review'
     ''')
-    events = c.fetchall()
-    conn.close()
+    events = [
+        {'id': row[0], 'theme': row[1], 'scheduled_time': row[2], 'status': row[3], 'type': row[4]}
+        for row in c.fetchall()
+    ]
 
-    return jsonify([dict(e) for e in events])
+    return jsonify(events)
 
 
 @app.route('/api/smart-themes')
@@ -1375,8 +1555,6 @@ def api_adapt_for_platform():
     Returns:
         Adapted caption with platform-specific optimizations
     """
-    import re
-
     data = request.json or {}
     caption = data.get('caption', '').strip()
     platform = data.get('platform', '').lower()
@@ -1520,8 +1698,6 @@ def api_post_to_instagram():
         }), 400
 
     try:
-        import requests
-
         # Step 1: Create media container
         container_url = f"https://graph.facebook.com/v18.0/{account_id}/media"
         container_response = requests.post(container_url, data={
@@ -1718,9 +1894,6 @@ def api_awareness_calendar_frontend():
 
     # Static fallback data with proper future date calculations
     def get_static_awareness_days():
-        from datetime import datetime, timedelta
-        import calendar
-
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         days = []
 
@@ -1740,7 +1913,7 @@ def api_awareness_calendar_frontend():
                 year += 1  # Next year
 
             month_start = datetime(year, month_num, 1)
-            last_day = calendar.monthrange(year, month_num)[1]
+            last_day = monthrange(year, month_num)[1]
             month_end = datetime(year, month_num, last_day)
 
             # Check if we're currently IN this month (active) or if it's upcoming
@@ -1964,10 +2137,7 @@ def api_giving_tuesday(year):
 
     if not reach_amplify:
         # Calculate date without REACH Amplify
-        from datetime import datetime, timedelta
-        import calendar
-
-        november = calendar.Calendar().itermonthdays2(year, 11)
+        november = Calendar().itermonthdays2(year, 11)
         thursdays = [day for day, weekday in november if day != 0 and weekday == 3]
 
         if len(thursdays) >= 4:
@@ -2355,8 +2525,6 @@ def get_audience_hashtags(audience: str, campaign_type: str) -> list:
 
 def extract_seo_keywords(caption: str, audience: str) -> list:
     """Extract SEO-friendly keywords from caption."""
-    import re
-
     # Base keywords that should always be present
     base_keywords = ['domestic violence', 'Chester County', 'support', 'help', 'free', 'confidential']
 
@@ -2465,7 +2633,6 @@ def calculate_discovery_score(caption: str, hashtags: list, keywords: list, plat
         breakdown.append({'item': 'Call to action', 'points': 0, 'max': 15, 'status': 'missing', 'tip': 'Add a call to action (visit, call, learn more)'})
 
     # Emoji usage (10 points)
-    import re
     emoji_pattern = re.compile("["
         u"\U0001F600-\U0001F64F"
         u"\U0001F300-\U0001F5FF"
@@ -2992,10 +3159,11 @@ Do NOT include hashtags - those will be added separately."""
         caption = generate_fallback_caption(topic, audience)
 
     # Extract optimization elements
-    seo_elements = extract_seo_elements(caption)
+    caption_lower = caption.lower()
+    seo_elements = extract_seo_elements(caption, caption_lower)
     aio_elements = extract_aio_elements(caption)
-    geo_elements = extract_geo_elements(caption)
-    aeo_elements = extract_aeo_elements(caption)
+    geo_elements = extract_geo_elements(caption, caption_lower)
+    aeo_elements = extract_aeo_elements(caption, caption_lower)
 
     # Generate hashtags
     hashtags = get_audience_hashtags(audience, campaign)[:15]
@@ -3040,10 +3208,10 @@ Reach out today at dvcccpa.org or call our 24-hour hotline. Hope lives here. 
     return templates.get(audience, templates['general'])
 
 
-def extract_seo_elements(caption: str) -> list:
+def extract_seo_elements(caption: str, caption_lower: str = None) -> list:
     """Extract SEO-friendly elements from caption."""
     elements = []
-    caption_lower = caption.lower()
+    caption_lower = caption_lower or caption.lower()
 
     # Check for key SEO elements
     seo_keywords = ['domestic violence', 'chester county', 'free', 'confidential', 'support', 'help', 'services', 'survivor']
@@ -3083,10 +3251,10 @@ def extract_aio_elements(caption: str) -> list:
     return elements
 
 
-def extract_geo_elements(caption: str) -> list:
+def extract_geo_elements(caption: str, caption_lower: str = None) -> list:
     """Extract Generative Engine Optimization elements."""
     elements = []
-    caption_lower = caption.lower()
+    caption_lower = caption_lower or caption.lower()
 
     # Check for authoritative language
     authority_phrases = ['we provide', 'our services', 'dvccc', 'at dvccc', 'we offer', 'our team']
@@ -3108,10 +3276,10 @@ def extract_geo_elements(caption: str) -> list:
     return elements
 
 
-def extract_aeo_elements(caption: str) -> list:
+def extract_aeo_elements(caption: str, caption_lower: str = None) -> list:
     """Extract Answer Engine Optimization elements (voice search)."""
     elements = []
-    caption_lower = caption.lower()
+    caption_lower = caption_lower or caption.lower()
 
     # Check for question-answer format
     if '?' in caption:
@@ -3140,10 +3308,14 @@ def extract_aeo_elements(caption: str) -> list:
 def get_multi_optimization_scores(caption: str, topic: str, platform: str) -> dict:
     """Calculate comprehensive optimization scores for SEO, AIO, GEO, AEO."""
 
-    seo_score = calculate_seo_score(caption, topic)
-    aio_score = calculate_aio_score(caption)
-    geo_score = calculate_geo_score(caption)
-    aeo_score = calculate_aeo_score(caption)
+    # Lowercasing and sentence splitting are shared by the scorers, so do them once
+    caption_lower = caption.lower()
+    features = _extract_features(caption, caption_lower)
+
+    seo_score = calculate_seo_score(caption, topic, caption_lower)
+    aio_score = calculate_aio_score(caption, features)
+    geo_score = calculate_geo_score(caption, features)
+    aeo_score = calculate_aeo_score(caption, features)
 
     # Calculate overall score
     overall = int((seo_score['score'] + aio_score['score'] + geo_score['score'] + aeo_score['score']) / 4)
@@ -3158,12 +3330,181 @@ def get_multi_optimization_scores(caption: str, topic: str, platform: str) -> di
     }
 
 
-def calculate_seo_score(caption: str, topic: str) -> dict:
+# Constant fields of each scorer's result; only score, grade and tips vary per caption
+_SEO_TEMPLATE = {'max_score': 100, 'focus': 'Keywords & Links', 'platform': 'Google / Bing', 'metric': 'Website Traffic'}
+_AIO_TEMPLATE = {'max_score': 100, 'focus': 'Clarity & Structure', 'platform': 'Google AI Overviews', 'metric': 'Summary Presence'}
+_GEO_TEMPLATE = {'max_score': 100, 'focus': 'Authority & Reputation', 'platform': 'ChatGPT / Perplexity', 'metric': 'Brand Citations'}
+_AEO_TEMPLATE = {'max_score': 100, 'focus': 'Direct Answers', 'platform': 'Siri / Alexa / Snippets', 'metric': 'Voice Answer'}
+
+
+def _tip_table(tips: tuple) -> tuple:
+    """Precompute the tips for every combination of failed checks (bit i set = tips[i] applies).
+
+    Entries are shared tuples; scorers return ``list(...)`` copies so every scorer's
+    ``tips`` is a list, matching calculate_seo_score.
+    """
+    return tuple(
+        tuple(tip for i, tip in enumerate(tips) if mask >> i & 1)
+        for mask in range(1 << len(tips))
+    )
+
+
+_AIO_TIPS = _tip_table((
+    'Add paragraph breaks or multiple sentences',
+    'Consider shorter sentences for clarity',
+    'Expand content for better AI summaries',
+    'Include factual details (free, confidential, available)',
+))
+_GEO_TIPS = _tip_table((
+    'Mention organization name or Chester County',
+    'Add trust signals (free, confidential, safe, available)',
+    'Add specific services or statistics',
+    'Use "we" voice (we provide, we help, we are here)',
+))
+_AEO_TIPS = _tip_table((
+    'Include action phrases (call, visit, reach out)',
+    'Use short, speakable sentences',
+    'Add a question or address common concerns',
+    'Mention Chester County or local community',
+))
+
+
+# Indicator phrases for the AIO/GEO/AEO scorers, matched as substrings of the lowercased caption
+_FACTUAL_INDICATORS = ('free', 'confidential', '24', 'chester county', 'dvccc', 'services',
+                       'support', 'help', 'available', 'safe', 'trained', 'professional')
+_BRAND_SIGNALS = ('dvccc', 'domestic violence center', 'chester county', 'center', 'organization', 'nonprofit')
+_TRUST_WORDS = ('free', 'confidential', 'professional', 'trained', 'certified', 'experienced', '24',
+                'safe', 'trusted', 'support', 'help', 'available', 'caring', 'dedicated')
+_SPECIFIC_WORDS = ('services', 'resources', 'hotline', 'shelter', 'counseling', 'advocacy')
+_EXPERT_PHRASES = ('we provide', 'our services', 'we offer', 'our team', 'we support',
+                   'we help', 'are here', 'is here', 'available for', 'reach out')
+_DIRECT_PATTERNS = ('you can', 'call', 'visit', 'contact', 'we offer', 'services include', 'help is available',
+                    'reach out', 'get help', 'find support', 'available', 'here for you', 'dm us', 'message')
+_QUESTION_INDICATORS = ('what', 'how', 'where', 'when', 'who', 'can i', 'is there', '?',
+                        'wondering', 'need help', 'looking for', 'know that')
+_LOCAL_SIGNALS = ('chester county', 'local', 'near', 'pennsylvania', 'pa', 'community', 'area', 'region')
+
+# Several phrases appear in more than one bucket, so each distinct phrase is searched for
+# once and credited to every bucket it belongs to
+_INDICATOR_BUCKETS = (_FACTUAL_INDICATORS, _BRAND_SIGNALS, _TRUST_WORDS, _SPECIFIC_WORDS,
+                      _EXPERT_PHRASES, _DIRECT_PATTERNS, _QUESTION_INDICATORS, _LOCAL_SIGNALS)
+_ALL_INDICATORS = tuple(dict.fromkeys(phrase for bucket in _INDICATOR_BUCKETS for phrase in bucket))
+_PHRASE_BUCKETS = {
+    phrase: tuple(i for i, bucket in enumerate(_INDICATOR_BUCKETS) if phrase in bucket)
+    for phrase in _ALL_INDICATORS
+}
+# Bucket counts past these caps can't raise a score any further (e.g. brand points max out at 3 x 10)
+_BUCKET_CAPS = (5, 3, 5, 1, 1, 5, 1, 4)
+
+
+def _score_arith(feat):
+    """
+    Turn integer caption features into the points awarded by each AIO/GEO/AEO check.
+
+    Works only on ints so it can be compiled with Numba (set NUMBA=1).
+    Returns the AIO, GEO and AEO check points in that order, four per scorer.
+    """
+    (has_structure, n_sentences, total_words, n_len, factual_count,
+     brand_found, trust_found, has_digit, has_specifics, expert_voice,
+     direct_found, voice_ready, handles_questions, local_found) = feat
+
+    # AIO - clear structure, sentence clarity, comprehensive coverage, factual content
+    structure = 25 if has_structure else 12
+    if n_sentences == 0:
+        clarity = 0
+    elif total_words < 30 * n_sentences:
+        clarity = 25
+    elif total_words < 40 * n_sentences:
+        clarity = 18
+    else:
+        clarity = 10
+    if n_len >= 150:
+        coverage = 25
+    elif n_len >= 80:
+        coverage = 20
+    elif n_len >= 50:
+        coverage = 15
+    else:
+        coverage = 8
+    factual = min(25, factual_count * 5)
+
+    # GEO - brand authority, reputation, citable information (minimum 8), expert voice
+    brand = min(30, brand_found * 10)
+    trust = min(25, trust_found * 5)
+    citable = 10 * has_digit + 10 * has_specifics
+    if n_len > 100:
+        citable += min(10, (n_len - 100) // 15)
+    citable = min(25, max(8, citable))
+    expert = 20 if expert_voice else 8
+
+    # AEO - direct answers, voice-friendly length, question handling, local intent (with minimums)
+    direct = max(10, min(30, direct_found * 6))
+    voice = max(10, min(25, voice_ready * 7))
+    question = 20 if handles_questions else 8
+    local = max(8, min(25, local_found * 8))
+
+    return (structure, clarity, coverage, factual,
+            brand, trust, citable, expert,
+            direct, voice, question, local)
+
+
+if os.getenv('NUMBA') == '1':
+    try:
+        from numba import njit
+        _score_arith = njit(cache=True)(_score_arith)
+        logger.info("Scoring arithmetic compiled with Numba")
+    except ImportError as e:
+        logger.warning(f"NUMBA=1 but Numba is not available: {e}")
+
+
+def _extract_counts(caption: str, caption_lower: str = None) -> tuple:
+    """Reduce a caption to the integer features that _score_arith scores."""
+    caption_lower = caption_lower or caption.lower()
+    sentences = [s.strip() for s in caption.replace('!', '.').replace('?', '.').split('.') if s.strip()]
+    sentence_words = [len(s.split()) for s in sentences]
+
+    bucket_counts = [0] * len(_INDICATOR_BUCKETS)
+    unsaturated = len(_INDICATOR_BUCKETS)
+    for phrase in _ALL_INDICATORS:
+        if phrase in caption_lower:
+            for i in _PHRASE_BUCKETS[phrase]:
+                bucket_counts[i] += 1
+                if bucket_counts[i] == _BUCKET_CAPS[i]:
+                    unsaturated -= 1
+            if not unsaturated:
+                # Every bucket is saturated, so the remaining phrases can't change any score
+                break
+    factual, brand, trust, specifics, expert, direct, question, local = bucket_counts
+
+    return (
+        int('\n' in caption or len(caption.split('. ')) >= 2),
+        len(sentence_words),
+        sum(sentence_words),
+        len(caption),
+        factual,
+        brand,
+        trust,
+        int(any(char.isdigit() for char in caption)),
+        int(specifics > 0),
+        int(expert > 0),
+        direct,
+        sum(1 for n in sentence_words if 3 <= n <= 25),
+        int(question > 0),
+        local
+    )
+
+
+def _extract_features(caption: str, caption_lower: str = None) -> dict:
+    """Precompute the caption features shared by the AIO/GEO/AEO scorers."""
+    counts = _extract_counts(caption, caption_lower)
+    return {'counts': counts, 'points': _score_arith(counts)}
+
+
+def calculate_seo_score(caption: str, topic: str, caption_lower: str = None) -> dict:
     """Calculate SEO optimization score."""
     score = 0
-    max_score = 100
     tips = []
-    caption_lower = caption.lower()
+    caption_lower = caption_lower or caption.lower()
 
     # Keyword presence (35 points) - More generous scoring
     keywords = ['domestic violence', 'chester county', 'support', 'help', 'free', 'confidential',
@@ -3206,218 +3547,86 @@ def calculate_seo_score(caption: str, topic: str) -> dict:
     else:
         tips.append('Add a call to action')
 
-    return {
-        'score': score,
-        'max_score': max_score,
-        'grade': score_to_grade(score),
-        'focus': 'Keywords & Links',
-        'platform': 'Google / Bing',
-        'metric': 'Website Traffic',
-        'tips': tips
-    }
+    return {**_SEO_TEMPLATE, 'score': score, 'grade': score_to_grade(score), 'tips': tips}
 
 
-def calculate_aio_score(caption: str) -> dict:
+def calculate_aio_score(caption: str, features: dict = None) -> dict:
     """Calculate AI Overview optimization score."""
-    score = 0
-    max_score = 100
-    tips = []
-
-    # Clear structure (25 points) - More flexible
-    has_structure = '\n\n' in caption or '\n' in caption or len(caption.split('. ')) >= 2
-    if has_structure:
-        score += 25
-    else:
-        tips.append('Add paragraph breaks or multiple sentences')
-        score += 12
-
-    # Sentence clarity (25 points) - More generous
-    sentences = [s.strip() for s in caption.replace('!', '.').replace('?', '.').split('.') if s.strip()]
-    if sentences:
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
-        if avg_length < 30:
-            score += 25
-        elif avg_length < 40:
-            score += 18
-        else:
-            tips.append('Consider shorter sentences for clarity')
-            score += 10
+    features = features or _extract_features(caption)
+    structure, clarity, coverage, factual = features['points'][0:4]
 
-    # Comprehensive coverage (25 points) - Lower threshold
-    if len(caption) >= 150:
-        score += 25
-    elif len(caption) >= 80:
-        score += 20
-    elif len(caption) >= 50:
-        score += 15
-    else:
-        tips.append('Expand content for better AI summaries')
-        score += 8
-
-    # Factual content (25 points) - More indicators
-    factual_indicators = ['free', 'confidential', '24', 'chester county', 'dvccc', 'services',
-                         'support', 'help', 'available', 'safe', 'trained', 'professional']
-    factual_count = sum(1 for fi in factual_indicators if fi in caption.lower())
-    factual_score = min(25, factual_count * 5)
-    score += factual_score
-    if factual_score < 15:
-        tips.append('Include factual details (free, confidential, available)')
+    tips = _AIO_TIPS[(structure < 25) | (clarity == 10) << 1 | (coverage == 8) << 2 | (factual < 15) << 3]
 
-    return {
-        'score': score,
-        'max_score': max_score,
-        'grade': score_to_grade(score),
-        'focus': 'Clarity & Structure',
-        'platform': 'Google AI Overviews',
-        'metric': 'Summary Presence',
-        'tips': tips
-    }
+    score = structure + clarity + coverage + factual
+    return {**_AIO_TEMPLATE, 'score': score, 'grade': score_to_grade(score), 'tips': list(tips)}
 
 
-def calculate_geo_score(caption: str) -> dict:
+def calculate_geo_score(caption: str, features: dict = None) -> dict:
     """Calculate Generative Engine Optimization score (ChatGPT/Perplexity)."""
-    score = 0
-    max_score = 100
-    tips = []
-    caption_lower = caption.lower()
+    features = features or _extract_features(caption)
+    brand, trust, citable, expert = features['points'][4:8]
 
-    # Brand authority (30 points) - More brand signals
-    brand_signals = ['dvccc', 'domestic violence center', 'chester county', 'center', 'organization', 'nonprofit']
-    brand_found = sum(1 for bs in brand_signals if bs in caption_lower)
-    brand_score = min(30, brand_found * 10)
-    score += brand_score
-    if brand_score < 20:
-        tips.append('Mention organization name or Chester County')
-
-    # Reputation indicators (25 points) - More trust words
-    trust_words = ['free', 'confidential', 'professional', 'trained', 'certified', 'experienced', '24',
-                   'safe', 'trusted', 'support', 'help', 'available', 'caring', 'dedicated']
-    trust_found = sum(1 for tw in trust_words if tw in caption_lower)
-    trust_score = min(25, trust_found * 5)
-    score += trust_score
-    if trust_score < 15:
-        tips.append('Add trust signals (free, confidential, safe, available)')
-
-    # Citable information (25 points) - More generous
-    has_numbers = any(char.isdigit() for char in caption)
-    has_specifics = any(w in caption_lower for w in ['services', 'resources', 'hotline', 'shelter', 'counseling', 'advocacy'])
-    citable_score = 0
-    if has_numbers:
-        citable_score += 10
-    if has_specifics:
-        citable_score += 10
-    if len(caption) > 100:
-        citable_score += min(10, (len(caption) - 100) // 15)
-    score += min(25, max(8, citable_score))  # Minimum 8 points
-    if citable_score < 12:
-        tips.append('Add specific services or statistics')
-
-    # Expert voice (20 points) - More flexible phrasing
-    expert_phrases = ['we provide', 'our services', 'we offer', 'our team', 'we support',
-                      'we help', 'are here', 'is here', 'available for', 'reach out']
-    if any(ep in caption_lower for ep in expert_phrases):
-        score += 20
-    else:
-        score += 8  # Partial credit
-        tips.append('Use "we" voice (we provide, we help, we are here)')
+    tips = _GEO_TIPS[(brand < 20) | (trust < 15) << 1 | (citable < 12) << 2 | (expert < 20) << 3]
 
-    return {
-        'score': score,
-        'max_score': max_score,
-        'grade': score_to_grade(score),
-        'focus': 'Authority & Reputation',
-        'platform': 'ChatGPT / Perplexity',
-        'metric': 'Brand Citations',
-        'tips': tips
-    }
+    score = brand + trust + citable + expert
+    return {**_GEO_TEMPLATE, 'score': score, 'grade': score_to_grade(score), 'tips': list(tips)}
 
 
-def calculate_aeo_score(caption: str) -> dict:
+def calculate_aeo_score(caption: str, features: dict = None) -> dict:
     """Calculate Answer Engine Optimization score (Voice assistants)."""
-    score = 0
-    max_score = 100
-    tips = []
-    caption_lower = caption.lower()
+    features = features or _extract_features(caption)
+    direct, voice, question, local = features['points'][8:12]
 
-    # Direct answers (30 points) - More patterns
-    direct_patterns = ['you can', 'call', 'visit', 'contact', 'we offer', 'services include', 'help is available',
-                       'reach out', 'get help', 'find support', 'available', 'here for you', 'dm us', 'message']
-    direct_found = sum(1 for dp in direct_patterns if dp in caption_lower)
-    direct_score = min(30, direct_found * 6)
-    score += max(10, direct_score)  # Minimum 10 points
-    if direct_score < 18:
-        tips.append('Include action phrases (call, visit, reach out)')
+    tips = _AEO_TIPS[(direct < 18) | (voice < 14) << 1 | (question < 20) << 2 | (local < 16) << 3]
 
-    # Voice-friendly length (25 points) - More flexible
-    sentences = [s.strip() for s in caption.replace('!', '.').replace('?', '.').split('.') if s.strip()]
-    voice_ready = [s for s in sentences if 3 <= len(s.split()) <= 25]
-    voice_score = min(25, len(voice_ready) * 7)
-    score += max(10, voice_score)  # Minimum 10 points
-    if voice_score < 14:
-        tips.append('Use short, speakable sentences')
-
-    # Question handling (20 points) - More triggers
-    question_indicators = ['what', 'how', 'where', 'when', 'who', 'can i', 'is there', '?',
-                          'wondering', 'need help', 'looking for', 'know that']
-    handles_questions = any(qi in caption_lower for qi in question_indicators)
-    if handles_questions:
-        score += 20
-    else:
-        score += 8  # Partial credit for any caption
-        tips.append('Add a question or address common concerns')
+    score = direct + voice + question + local
+    return {**_AEO_TEMPLATE, 'score': score, 'grade': score_to_grade(score), 'tips': list(tips)}
 
-    # Local intent (25 points) - More signals
-    local_signals = ['chester county', 'local', 'near', 'pennsylvania', 'pa', 'community', 'area', 'region']
-    local_found = sum(1 for ls in local_signals if ls in caption_lower)
-    local_score = min(25, local_found * 8)
-    score += max(8, local_score)  # Minimum 8 points
-    if local_score < 16:
-        tips.append('Mention Chester County or local community')
 
-    return {
-        'score': score,
-        'max_score': max_score,
-        'grade': score_to_grade(score),
-        'focus': 'Direct Answers',
-        'platform': 'Siri / Alexa / Snippets',
-        'metric': 'Voice Answer',
-        'tips': tips
-    }
+# Lower bounds of the D, C, B and A grades; anything below 60 is an F
+_GRADE_CUTOFFS = (60, 70, 80, 90)
+_GRADES = ('F', 'D', 'C', 'B', 'A')
 
 
 def score_to_grade(score: int) -> str:
     """Convert numeric score to letter grade."""
-    if score >= 90:
-        return 'A'
-    elif score >= 80:
-        return 'B'
-    elif score >= 70:
-        return 'C'
-    elif score >= 60:
-        return 'D'
-    else:
-        return 'F'
+    return _GRADES[bisect.bisect_right(_GRADE_CUTOFFS, score)]
 
 
-@app.route('/settings')
-def settings_page():
-    """Settings page for API configuration."""
-    # Check current configuration status
-    config_status = {
+def read_config_status() -> dict:
+    """Check which API credentials are present in the environment."""
+    return {
         'openai': bool(os.getenv('OPENAI_API_KEY')),
         'imgbb': bool(os.getenv('IMGBB_API_KEY')),
         'instagram_token': bool(os.getenv('INSTAGRAM_ACCESS_TOKEN')),
         'instagram_account': bool(os.getenv('INSTAGRAM_ACCOUNT_ID'))
     }
+
+
+# Environment variables don't change while the process runs, so check them once
+config_status = read_config_status()
+
+
+@app.route('/settings')
+def settings_page():
+    """Settings page for API configuration."""
     return render_template('settings.html', config_status=config_status)
 
 
-# Initialize database on startup
-try:
-    init_db()
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize database: {e}")
+def setup_database():
+    """Create or migrate the database; run once by the process that owns it, not on import."""
+    try:
+        init_db()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or migrate the SQLite database."""
+    setup_database()
+
 
 logger.info("DVCCC Instagram Content Manager - Ready")
 
@@ -3426,12 +3635,20 @@ if __name__ == '__main__':
     # Get port from environment variable (for deployment) or use 5001
     port = int(os.environ.get('PORT', 5001))
 
-    print("\n" + "="*60)
-    print("  DVCCC Instagram Content Manager")
-    print("="*60)
-    print(f"\n  Open in browser: http://127.0.0.1:{port}")
-    print("  Background scheduler: " + ("ACTIVE" if start_web_scheduler else "DISABLED"))
-    print("="*60 + "\n")
+    sys.stdout.write('\n'.join([
+        '',
+        '=' * 60,
+        '  DVCCC Instagram Content Manager',
+        '=' * 60,
+        '',
+        f'  Open in browser: http://127.0.0.1:{port}',
+        '  Background scheduler: ' + ('ACTIVE' if start_web_scheduler else 'DISABLED'),
+        '=' * 60,
+        '',
+        ''
+    ]))
+
+    setup_database()
 
     # Start background scheduler if available
     if start_web_scheduler:
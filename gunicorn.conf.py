@@ -0,0 +1,12 @@
+"""Gunicorn settings and hooks, loaded automatically when gunicorn starts from the project root."""
+
+import os
+
+# Request threads per gthread worker; app.py sizes its connection pool from the same variable
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+
+def on_starting(server):
+    """Set up the database once in the master process, before any worker is forked."""
+    from app import setup_database
+    setup_database()
@@ -16,10 +16,6 @@ Usage:
 import argparse
 import logging
 import sys
-from pathlib import Path
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
 
 from config import settings
 from src.instagram_client import InstagramClient
@@ -100,8 +96,8 @@ class InstagramAutoPoster:
 
             # Step 1: Analyze trends
             logger.info("Step 1: Analyzing trends...")
-            trend_context = self.trend_analyzer.get_content_prompt_context()
             trends = self.trend_analyzer.get_trending_topics()
+            trend_context = self.trend_analyzer.get_content_prompt_context(trends)
             theme = trends["theme"]
             logger.info(f"Selected theme: {theme}")
 
@@ -0,0 +1,8 @@
+"""Constants shared by the web app and the background scheduler."""
+
+# Organization description passed to the caption generator
+CHANNEL_DESC = (
+    "We are the Domestic Violence Center of Chester County (DVCCC), "
+    "providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of "
+    "domestic violence in Chester County, PA."
+)
@@ -1,15 +1,182 @@
 import os
+import random
+import hashlib
+import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
+from contextlib import contextmanager
 import httpx
+import numpy as np
 from openai import OpenAI
 from PIL import Image
 from io import BytesIO
 from src.utils.logger import setup_logger
 
+logger = setup_logger("ImageGenerator")
+
 # Longer timeout for DALL-E (image generation takes longer)
 OPENAI_TIMEOUT = httpx.Timeout(180.0, connect=30.0)  # 180 sec total, 30 sec connect
 
+# Read size for streamed downloads; a 1-4 MB DALL-E image takes a dozen or
+# so reads instead of hundreds
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Encoder settings for the Instagram-ready JPEG. Instagram re-encodes uploads,
+# so the extra Huffman-optimization pass (optimize=True) isn't worth its CPU
+INSTAGRAM_JPEG = {"quality": 90, "subsampling": 2}  # 4:2:0 chroma
+
+# Keep-alive session for image downloads, shared by all instances so
+# back-to-back downloads from the DALL-E CDN reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Shared generator for film grain; draws float32 directly
+_RNG = np.random.default_rng()
+
+
+# Set when _authenticity_pass is the Numba kernel and has not been compiled yet
+_KERNEL_COLD = False
+
+# ITU-R 601 luma weights, as used by PIL's "L" conversion
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _blur3(img_array, radius, scratch):
+    """
+    Gaussian-blur a float32 (height, width, 3) array in place with a separable 3-tap kernel.
+
+    For the sub-pixel radii used here a [side, 1 - 2*side, side] kernel with
+    the same variance (side = radius**2 / 2) matches ImageFilter.GaussianBlur
+    closely, at a fraction of the cost. Edges are clamped. scratch is a
+    buffer of the same shape that holds the vertical pass.
+    """
+    side = np.float32(radius * radius / 2)
+    centre = np.float32(1 - 2 * side)
+    for axis, src, out in ((0, img_array, scratch), (1, scratch, img_array)):
+        src = np.moveaxis(src, axis, 0)
+        out = np.moveaxis(out, axis, 0)
+        np.multiply(src, centre, out=out)
+        out[1:] += src[:-1] * side
+        out[:-1] += src[1:] * side
+        out[0] += src[0] * side
+        out[-1] += src[-1] * side
+    return img_array
+
+
+def _authenticity_pass(pixels, noise, noise_intensity, warmth, saturation, gain, pivot_gain, vignette, blur_radius,
+                       work, scratch):
+    """
+    Apply grain, warmth, saturation, contrast/brightness/cast, vignette and blur.
+
+    Saturation blends each pixel toward its luma and contrast pulls it toward
+    the mean luma (as ImageEnhance.Color/Contrast do); together with
+    brightness and the color cast they reduce to one affine step with the
+    per-channel factors gain and pivot_gain.
+
+    Args:
+        pixels: uint8 (height, width, 3) RGB image
+        noise: float32 unit-variance grain of the same shape
+        noise_intensity: Grain standard deviation
+        warmth: float32 per-channel temperature factors
+        saturation: Saturation factor
+        gain: float32 per-channel factors applied to the saturated pixel
+        pivot_gain: float32 per-channel factors applied to the mean luma
+        vignette: float32 (height, width) brightness mask
+        blur_radius: Gaussian blur radius (at most 1), or 0 for no blur
+        work, scratch: float32 buffers of the image's shape, overwritten
+
+    Returns:
+        uint8 RGB array
+    """
+    img_array = work
+    np.copyto(img_array, pixels)
+    img_array += np.multiply(noise, np.float32(noise_intensity), out=scratch)
+    img_array *= warmth
+
+    luma = img_array @ _LUMA
+    img_array *= saturation * gain
+    img_array += np.multiply(luma[:, :, None], (1 - saturation) * gain, out=scratch)
+    img_array += float(luma.mean()) * pivot_gain
+    img_array *= vignette[:, :, None]
+    if blur_radius:
+        _blur3(img_array, blur_radius, scratch)
+    return np.clip(img_array, 0, 255, out=img_array).astype(np.uint8)
+
+
+if os.getenv('NUMBA') == '1':
+    try:
+        from numba import njit
+
+        # Serial on purpose: images are already processed concurrently by the
+        # request and executor threads, and Numba's default threading layer
+        # aborts on concurrent parallel calls (OpenMP breaks under --preload)
+        @njit(cache=True, fastmath=True)
+        def _authenticity_pass(pixels, noise, noise_intensity, warmth, saturation, gain, pivot_gain, vignette,
+                               blur_radius, work, scratch):
+            height, width, _ = pixels.shape
+            w_r = warmth[0] * _LUMA[0]
+            w_g = warmth[1] * _LUMA[1]
+            w_b = warmth[2] * _LUMA[2]
+
+            # First pass: mean luma, the contrast pivot
+            total = 0.0
+            for y in range(height):
+                row = 0.0
+                for x in range(width):
+                    row += ((pixels[y, x, 0] + noise[y, x, 0] * noise_intensity) * w_r
+                            + (pixels[y, x, 1] + noise[y, x, 1] * noise_intensity) * w_g
+                            + (pixels[y, x, 2] + noise[y, x, 2] * noise_intensity) * w_b)
+                total += row
+            mean_luma = total / (height * width)
+
+            # Second pass: everything but the blur, one pixel at a time in registers
+            shaded = work
+            for y in range(height):
+                for x in range(width):
+                    r = (pixels[y, x, 0] + noise[y, x, 0] * noise_intensity) * warmth[0]
+                    g = (pixels[y, x, 1] + noise[y, x, 1] * noise_intensity) * warmth[1]
+                    b = (pixels[y, x, 2] + noise[y, x, 2] * noise_intensity) * warmth[2]
+                    lum = (r * _LUMA[0] + g * _LUMA[1] + b * _LUMA[2]) * (1 - saturation)
+                    v = vignette[y, x]
+                    for c, val in ((0, r), (1, g), (2, b)):
+                        shaded[y, x, c] = ((val * saturation + lum) * gain[c] + mean_luma * pivot_gain[c]) * v
+
+            # Third pass: 3x3 blur (same kernel as _blur3) and clip
+            side = blur_radius * blur_radius / 2
+            taps = (side, 1 - 2 * side, side)
+            out = np.empty((height, width, 3), np.uint8)
+            for y in range(height):
+                for x in range(width):
+                    for c in range(3):
+                        val = shaded[y, x, c]
+                        if side > 0:
+                            val = 0.0
+                            for dy in range(3):
+                                yy = min(max(y + dy - 1, 0), height - 1)
+                                for dx in range(3):
+                                    xx = min(max(x + dx - 1, 0), width - 1)
+                                    val += taps[dy] * taps[dx] * shaded[yy, xx, c]
+                        out[y, x, c] = min(255.0, max(0.0, val))
+            return out
+        _KERNEL_COLD = True
+    except ImportError as e:
+        logger.warning(f"NUMBA=1 but Numba is not available: {e}")
+
+
+def _warm_up_kernel():
+    """Compile the Numba authenticity kernel once, so the first post doesn't pay for it."""
+    global _KERNEL_COLD
+    if not _KERNEL_COLD:
+        return
+    _KERNEL_COLD = False
+    ones = np.ones(3, np.float32)
+    _authenticity_pass(np.zeros((2, 2, 3), np.uint8), np.zeros((2, 2, 3), np.float32), 1.0,
+                       ones, 1.0, ones, ones, np.ones((2, 2), np.float32), 0.5,
+                       np.empty((2, 2, 3), np.float32), np.empty((2, 2, 3), np.float32))
+    logger.info("Authenticity kernel compiled with Numba")
+
 
 class ImageGenerator:
     """Generates images using OpenAI DALL-E."""
@@ -17,7 +184,8 @@ class ImageGenerator:
     def __init__(
         self,
         api_key: str = None,
-        output_dir: str = "generated_images"
+        output_dir: str = "generated_images",
+        authenticity_level: str = None
     ):
         """
         Initialize the image generator.
@@ -25,21 +193,39 @@ class ImageGenerator:
         Args:
             api_key: OpenAI API key (or set OPENAI_API_KEY env var)
             output_dir: Directory to save generated images
+            authenticity_level: "fast" (vignette and slight blur only) or
+                "full" (or set AUTHENTICITY_LEVEL env var, default "fast")
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
 
+        self.authenticity_level = authenticity_level or os.getenv("AUTHENTICITY_LEVEL", "fast")
+        if self.authenticity_level not in ("fast", "full"):
+            raise ValueError(f"Unknown authenticity level: {self.authenticity_level}")
+
         # Explicitly set base_url to override any OPENAI_BASE_URL env var
-        self.client = OpenAI(api_key=self.api_key, base_url="https://api.openai.com/v1", timeout=OPENAI_TIMEOUT)
+        self.client = self._get_client(self.api_key, "https://api.openai.com/v1")
         self.output_dir = output_dir
         self.logger = setup_logger("ImageGenerator")
 
+        # Compile the Numba kernel here rather than at import, so it happens
+        # in the worker process and not in the pre-fork gunicorn master
+        _warm_up_kernel()
+
+        # Float32 working buffers for the effects, reused across images and
+        # shared by the request threads, so rented under a lock
+        self._buffers = {}
+        self._buffers_lock = threading.Lock()
+
+        # Fallbacks in a shuffled order so consecutive retries never repeat one
+        self._fallback_prompts = iter(random.sample(self.SAFE_FALLBACK_PROMPTS, len(self.SAFE_FALLBACK_PROMPTS)))
+
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
 
     # Fallback prompts - 25+ diverse themes (not just trees/nature)
-    SAFE_FALLBACK_PROMPTS = [
+    SAFE_FALLBACK_PROMPTS = (
         # ABSTRACT HOPE/LIGHT
         "Soft golden light rays filtering through morning mist, warm atmosphere, shot on iPhone 14, slight lens flare, natural overexposure, grainy film texture, no people, no text",
         "Out-of-focus warm evening lights creating gentle bokeh, golden hour fading to dusk, shallow depth of field, nostalgic film grain, accidentally aesthetic, no text",
@@ -86,7 +272,30 @@ class ImageGenerator:
         "Single purple flower against simple background, natural windowsill placement, minimalist hope symbol, candid still life, soft light, no text",
         "Smooth river stone on weathered driftwood, simple grounding moment, natural textures, minimal composition, calming simplicity, no text",
         "Soft focus morning through sheer curtains, ethereal diffused light, dreamy sanctuary atmosphere, gentle bokeh, film grain, no text"
-    ]
+    )
+
+    # OpenAI clients keyed by (api_key, base_url), shared by all instances so
+    # a new generator reuses the existing keep-alive connections
+    _CLIENTS = {}
+
+    # Vignette distance fields keyed by (width, height), shared by all instances
+    _VIGNETTE_CACHE = {}
+
+    # Unit-variance grain drawn once per process; each image takes a window at
+    # a random offset (~20 MB, so only a little larger than a 1080x1080 post)
+    _NOISE_POOL_SIZE = 1280
+    _NOISE_POOL = None
+
+    @classmethod
+    def _get_client(cls, api_key: str, base_url: str) -> OpenAI:
+        """Return the shared OpenAI client for this key and endpoint, creating it on first use."""
+        client = cls._CLIENTS.get((api_key, base_url))
+        if client is None:
+            client = cls._CLIENTS.setdefault(
+                (api_key, base_url),
+                OpenAI(api_key=api_key, base_url=base_url, timeout=OPENAI_TIMEOUT)
+            )
+        return client
 
     def generate_image(
         self,
@@ -95,7 +304,8 @@ class ImageGenerator:
         quality: str = "standard",
         style: str = "vivid",
         filename: str = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        for_instagram: bool = False
     ) -> dict:
         """
         Generate an image using DALL-E 3.
@@ -107,6 +317,8 @@ class ImageGenerator:
             style: Image style (vivid or natural)
             filename: Custom filename (without extension)
             max_retries: Number of retries with fallback prompts
+            for_instagram: Save only the Instagram-ready version (what
+                optimize_for_instagram produces) straight from the download
 
         Returns:
             Dictionary with image path and metadata
@@ -130,7 +342,7 @@ class ImageGenerator:
                 revised_prompt = response.data[0].revised_prompt
 
                 # Download and save the image
-                image_path = self._download_image(image_url, filename)
+                image_path = self._download_image(image_url, filename, for_instagram)
 
                 self.logger.info(f"Image generated and saved to: {image_path}")
 
@@ -148,53 +360,68 @@ class ImageGenerator:
                 error_str = str(e)
                 if "content_policy_violation" in error_str or "safety system" in error_str:
                     if attempt < max_retries - 1:
-                        import random
-                        current_prompt = random.choice(self.SAFE_FALLBACK_PROMPTS)
+                        current_prompt = next(self._fallback_prompts, random.choice(self.SAFE_FALLBACK_PROMPTS))
                         self.logger.warning(f"Safety filter triggered, trying fallback prompt (attempt {attempt + 2}/{max_retries})")
                         continue
                 self.logger.error(f"Error generating image: {e}")
                 raise
 
-    def _download_image(self, url: str, filename: str = None) -> str:
+    def _download_image(self, url: str, filename: str = None, for_instagram: bool = False) -> str:
         """
         Download image from URL and save locally.
 
         Args:
             url: Image URL
             filename: Custom filename (without extension)
+            for_instagram: Resize and add authenticity effects to the decoded
+                download instead of saving it as-is
 
         Returns:
             Path to saved image
         """
-        # Generate filename if not provided
-        if not filename:
-            import uuid
-            filename = f"generated_{uuid.uuid4().hex[:8]}"
+        # Name by URL if not provided, so a retried download of the same
+        # image finds the file it already saved
+        named_by_url = not filename
+        if named_by_url:
+            filename = f"generated_{hashlib.sha1(url.encode()).hexdigest()[:16]}"
 
         # Save as JPEG directly (less memory than PNG compression)
-        image_path = os.path.join(self.output_dir, f"{filename}.jpg")
-
-        # Stream download to reduce memory usage
-        with requests.get(url, timeout=60, stream=True) as response:
+        suffix = "_instagram" if for_instagram else ""
+        image_path = os.path.join(self.output_dir, f"{filename}{suffix}.jpg")
+        if named_by_url and os.path.exists(image_path):
+            self.logger.info(f"Image already downloaded: {image_path}")
+            return image_path
+
+        # Stream the download into memory; DALL-E images are only a few MB,
+        # so there is no need for a temp file on disk
+        buffer = BytesIO()
+        with _SESSION.get(url, timeout=60, stream=True) as response:
             response.raise_for_status()
-
-            # Download in chunks to temp file
-            temp_path = image_path + ".tmp"
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-        # Verify and convert to JPEG (more memory efficient than PNG)
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+        buffer.seek(0)
+
+        # Write to a temp file next to the target and rename it into place, so
+        # image_path only ever holds a complete image: a concurrent caller or a
+        # crash mid-write can't leave a partial file for the check above to reuse
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=f".{filename}", suffix=".tmp")
         try:
-            image = Image.open(temp_path)
-            if image.mode in ("RGBA", "P"):
-                image = image.convert("RGB")
-            image.save(image_path, "JPEG", quality=95)
-            image.close()
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            with os.fdopen(fd, "wb") as f, Image.open(buffer) as image:
+                # Verify and convert to JPEG (more memory efficient than PNG)
+                if for_instagram:
+                    # One decode and one encode instead of a raw JPEG round-trip
+                    self._prepare_for_instagram(image).save(f, "JPEG", **INSTAGRAM_JPEG)
+                elif image.format == "JPEG":
+                    # Already a JPEG: keep the downloaded bytes, no decode/re-encode
+                    f.write(buffer.getbuffer())
+                else:
+                    if image.mode in ("RGBA", "P"):
+                        image = image.convert("RGB")
+                    image.save(f, "JPEG", quality=95)
+            os.replace(tmp_path, image_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
         return image_path
 
@@ -219,6 +446,11 @@ class ImageGenerator:
 
         image = Image.open(image_path)
 
+        # Let libjpeg decode straight at a reduced scale when the source is
+        # at least twice the target size
+        if image.format == "JPEG":
+            image.draft("RGB", target_size)
+
         # Use high-quality resampling
         resized = image.resize(target_size, Image.Resampling.LANCZOS)
 
@@ -244,52 +476,84 @@ class ImageGenerator:
         """
         self.logger.info("Optimizing image for Instagram")
 
-        image = Image.open(image_path)
+        image = self._prepare_for_instagram(Image.open(image_path), add_authenticity)
 
-        # Convert to RGB if necessary (Instagram doesn't support RGBA)
-        if image.mode in ("RGBA", "P"):
-            image = image.convert("RGB")
+        # Save as JPEG with optimal quality for Instagram
+        base, _ = os.path.splitext(image_path)
+        output_path = f"{base}_instagram.jpg"
 
+        image.save(output_path, "JPEG", **INSTAGRAM_JPEG)
+        self.logger.info(f"Optimized image saved to: {output_path}")
+
+        return output_path
+
+    def _prepare_for_instagram(self, image: Image.Image, add_authenticity: bool = True) -> Image.Image:
+        """Convert, resize and add authenticity effects to a freshly opened image."""
         # Instagram optimal size for feed posts
         target_size = (1080, 1080)
 
-        # Resize if needed
+        # Decode large JPEGs at a reduced scale instead of at full resolution
+        if image.format == "JPEG":
+            image.draft("RGB", target_size)
+
+        # Convert to RGB if necessary (Instagram doesn't support RGBA)
+        if image.mode in ("RGBA", "P"):
+            image = image.convert("RGB")
+
+        # Resize if needed; reducing_gap box-shrinks big sources before LANCZOS
         if image.size != target_size:
-            image = image.resize(target_size, Image.Resampling.LANCZOS)
+            image = image.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
 
         # Add authenticity effects to reduce AI look
         if add_authenticity:
-            image = self._add_authenticity_effects(image)
+            if self.authenticity_level == "fast":
+                image = self._cheap_effects(image)
+            else:
+                image = self._add_authenticity_effects(image)
 
-        # Save as JPEG with optimal quality for Instagram
-        base, _ = os.path.splitext(image_path)
-        output_path = f"{base}_instagram.jpg"
+        return image
 
-        image.save(output_path, "JPEG", quality=92, optimize=True)
-        self.logger.info(f"Optimized image saved to: {output_path}")
+    def _cheap_effects(self, image: Image.Image) -> Image.Image:
+        """
+        Add only the effects that survive Instagram's own JPEG re-encode.
 
-        return output_path
+        Grain and the subtle color/contrast shifts are mostly lost when
+        Instagram recompresses the upload, so the "fast" level keeps just a
+        vignette and a slight softening blur.
+
+        Args:
+            image: PIL Image object
+
+        Returns:
+            Modified image with vignette and blur
+        """
+        pixels = np.asarray(image)
+        height, width = pixels.shape[:2]
+        vignette = self._vignette_mask(width, height, random.uniform(0.05, 0.18))
+
+        # Neither the mask nor the blur can leave 0-255, so no clipping is needed
+        with self._working_buffers(pixels.shape) as (work, scratch):
+            np.multiply(pixels, vignette[:, :, None], out=work)
+            return Image.fromarray(_blur3(work, 0.5, scratch).astype(np.uint8))
 
     def _add_authenticity_effects(self, image: Image.Image) -> Image.Image:
         """
         Add stronger effects to make AI images look more authentic/real.
 
+        All random settings are drawn first; grain, warmth, saturation,
+        contrast, brightness, color cast, vignette and blur are then applied
+        in a single pass by _authenticity_pass.
+
         Args:
             image: PIL Image object
 
         Returns:
             Modified image with authenticity effects
         """
-        import random
-        from PIL import ImageEnhance, ImageFilter
-        import numpy as np
-
         # Choose a random "camera style" for consistent effects
         camera_style = random.choice(['iphone', 'film', 'mirrorless', 'vintage'])
 
-        img_array = np.array(image)
-
-        # 1. Add realistic film grain/noise (stronger than before)
+        # 1. Realistic film grain/noise (stronger than before)
         if camera_style == 'film':
             noise_intensity = random.uniform(8, 14)  # Stronger for film look
         elif camera_style == 'vintage':
@@ -297,13 +561,16 @@ class ImageGenerator:
         else:
             noise_intensity = random.uniform(5, 10)  # Moderate for digital
 
-        noise = np.random.normal(0, noise_intensity, img_array.shape).astype(np.int16)
-        img_array = np.clip(img_array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-
-        image = Image.fromarray(img_array)
+        # 2. Color temperature shift (warmer or cooler based on style)
+        warmth = np.ones(3, dtype=np.float32)
+        if camera_style in ['film', 'vintage']:
+            # Warm vintage look
+            warmth[0], warmth[2] = random.uniform(1.03, 1.07), random.uniform(0.93, 0.97)
+        elif random.random() > 0.5:
+            # Slight warmth
+            warmth[0], warmth[2] = random.uniform(1.01, 1.04), random.uniform(0.96, 0.99)
 
-        # 2. Reduce saturation more noticeably (AI images are often oversaturated)
-        enhancer = ImageEnhance.Color(image)
+        # 3. Reduce saturation more noticeably (AI images are often oversaturated)
         if camera_style == 'vintage':
             saturation = random.uniform(0.80, 0.88)  # More faded
         elif camera_style == 'film':
@@ -311,114 +578,130 @@ class ImageGenerator:
         else:
             saturation = random.uniform(0.88, 0.95)  # Subtle
 
-        image = enhancer.enhance(saturation)
-
-        # 3. Color temperature shift (warmer or cooler based on style)
-        r, g, b = image.split()
-        if camera_style in ['film', 'vintage']:
-            # Warm vintage look
-            r = r.point(lambda x: min(255, int(x * random.uniform(1.03, 1.07))))
-            b = b.point(lambda x: int(x * random.uniform(0.93, 0.97)))
-        elif random.random() > 0.5:
-            # Slight warmth
-            r = r.point(lambda x: min(255, int(x * random.uniform(1.01, 1.04))))
-            b = b.point(lambda x: int(x * random.uniform(0.96, 0.99)))
-
-        image = Image.merge('RGB', (r, g, b))
-
         # 4. Reduce sharpness (AI images are unnaturally sharp)
+        blur_radius = 0
         if camera_style == 'iphone':
             # iPhones have some processing but not razor sharp
             if random.random() > 0.3:
-                image = image.filter(ImageFilter.GaussianBlur(radius=random.uniform(0.3, 0.6)))
+                blur_radius = random.uniform(0.3, 0.6)
         else:
             # Film/vintage have softer look
-            image = image.filter(ImageFilter.GaussianBlur(radius=random.uniform(0.4, 0.8)))
+            blur_radius = random.uniform(0.4, 0.8)
 
         # 5. Contrast adjustment (often slightly lower in real photos)
-        enhancer = ImageEnhance.Contrast(image)
         if camera_style == 'vintage':
             contrast = random.uniform(0.90, 0.96)  # Lower contrast for vintage
         else:
             contrast = random.uniform(0.94, 1.02)
 
-        image = enhancer.enhance(contrast)
-
         # 6. Brightness variation (real photos often slightly over/under exposed)
-        enhancer = ImageEnhance.Brightness(image)
         brightness = random.uniform(0.97, 1.05)
-        image = enhancer.enhance(brightness)
 
-        # 7. Add vignette (more noticeable for vintage/film)
+        # 7. Vignette (more noticeable for vintage/film)
         if camera_style in ['vintage', 'film']:
             vignette_intensity = random.uniform(0.10, 0.18)
         else:
             vignette_intensity = random.uniform(0.05, 0.10)
 
-        image = self._add_vignette(image, intensity=vignette_intensity)
-
-        # 8. Add subtle color cast (photos often have slight color biases)
-        if random.random() > 0.6:
-            image = self._add_color_cast(image)
+        # 8. Subtle color cast (photos often have slight color biases)
+        cast = self._color_cast_scale() if random.random() > 0.6 else np.ones(3, dtype=np.float32)
+
+        pixels = np.asarray(image)
+        height, width = pixels.shape[:2]
+        with self._working_buffers(pixels.shape) as (work, scratch):
+            image = Image.fromarray(_authenticity_pass(
+                pixels,
+                self._grain(pixels.shape),
+                noise_intensity,
+                warmth,
+                saturation,
+                (contrast * brightness) * cast,
+                ((1 - contrast) * brightness) * cast,
+                self._vignette_mask(width, height, vignette_intensity),
+                blur_radius,
+                work,
+                scratch,
+            ))
 
         return image
 
-    def _add_color_cast(self, image: Image.Image) -> Image.Image:
-        """Add subtle color cast like real photos often have."""
-        import random
-        import numpy as np
+    @contextmanager
+    def _working_buffers(self, shape: tuple):
+        """
+        Rent a pair of float32 buffers of the given shape for one image.
+
+        At most one pair per shape is kept for reuse (~28 MB at 1080x1080);
+        a concurrent caller gets a fresh pair that is dropped afterwards.
+        """
+        with self._buffers_lock:
+            buffers = self._buffers.pop(shape, None)
+        if buffers is None:
+            buffers = (np.empty(shape, np.float32), np.empty(shape, np.float32))
+        try:
+            yield buffers
+        finally:
+            with self._buffers_lock:
+                self._buffers.setdefault(shape, buffers)
+
+    def _grain(self, shape: tuple) -> np.ndarray:
+        """Return standard-normal float32 film grain of the given (height, width, 3) shape."""
+        height, width = shape[:2]
+        size = self._NOISE_POOL_SIZE
+        if height > size or width > size:
+            return _RNG.standard_normal(shape, dtype=np.float32)
+
+        if ImageGenerator._NOISE_POOL is None:
+            pool = _RNG.standard_normal((size, size, 3), dtype=np.float32)
+            pool.flags.writeable = False  # windows are shared views
+            ImageGenerator._NOISE_POOL = pool
 
-        img_array = np.array(image).astype(np.float32)
+        y, x = _RNG.integers(0, [size - height + 1, size - width + 1])
+        return ImageGenerator._NOISE_POOL[y:y + height, x:x + width]
+
+    def _color_cast_scale(self) -> np.ndarray:
+        """Pick a subtle per-channel color cast like real photos often have."""
+        scale = np.ones(3, dtype=np.float32)
 
         # Choose a subtle color cast
         cast_type = random.choice(['warm', 'cool', 'green', 'magenta'])
 
         if cast_type == 'warm':
-            img_array[:, :, 0] *= random.uniform(1.01, 1.03)  # More red
-            img_array[:, :, 2] *= random.uniform(0.97, 0.99)  # Less blue
+            scale[0] = random.uniform(1.01, 1.03)  # More red
+            scale[2] = random.uniform(0.97, 0.99)  # Less blue
         elif cast_type == 'cool':
-            img_array[:, :, 0] *= random.uniform(0.97, 0.99)  # Less red
-            img_array[:, :, 2] *= random.uniform(1.01, 1.03)  # More blue
+            scale[0] = random.uniform(0.97, 0.99)  # Less red
+            scale[2] = random.uniform(1.01, 1.03)  # More blue
         elif cast_type == 'green':
-            img_array[:, :, 1] *= random.uniform(1.01, 1.02)  # Slight green
+            scale[1] = random.uniform(1.01, 1.02)  # Slight green
         elif cast_type == 'magenta':
-            img_array[:, :, 0] *= random.uniform(1.01, 1.02)  # Slight red
-            img_array[:, :, 2] *= random.uniform(1.01, 1.02)  # Slight blue
-
-        img_array = np.clip(img_array, 0, 255).astype(np.uint8)
-        return Image.fromarray(img_array)
+            scale[0] = random.uniform(1.01, 1.02)  # Slight red
+            scale[2] = random.uniform(1.01, 1.02)  # Slight blue
 
-        return image
+        return scale
 
-    def _add_vignette(self, image: Image.Image, intensity: float = 0.1) -> Image.Image:
+    def _vignette_mask(self, width: int, height: int, intensity: float = 0.1) -> np.ndarray:
         """
-        Add a subtle vignette effect like real camera lenses produce.
+        Build a subtle vignette mask like real camera lenses produce.
 
         Args:
-            image: PIL Image object
+            width: Image width
+            height: Image height
             intensity: How strong the vignette should be (0-1)
 
         Returns:
-            Image with vignette effect
+            float32 (height, width) array of per-pixel brightness factors
         """
-        import numpy as np
-
-        width, height = image.size
-        img_array = np.array(image).astype(np.float32)
-
-        # Create vignette mask
-        x = np.linspace(-1, 1, width)
-        y = np.linspace(-1, 1, height)
-        X, Y = np.meshgrid(x, y)
-        distance = np.sqrt(X**2 + Y**2)
-
-        # Smooth falloff from center
-        vignette = 1 - (distance * intensity)
-        vignette = np.clip(vignette, 0.7, 1)
-
-        # Apply to all channels
-        for i in range(3):
-            img_array[:, :, i] = img_array[:, :, i] * vignette
-
-        img_array = np.clip(img_array, 0, 255).astype(np.uint8)
-        return Image.fromarray(img_array)
+        # Distance from the center only depends on the size (almost always
+        # 1080x1080), so it is computed once and reused for every image
+        distance = self._VIGNETTE_CACHE.get((width, height))
+        if distance is None:
+            x = np.linspace(-1, 1, width, dtype=np.float32)
+            y = np.linspace(-1, 1, height, dtype=np.float32)
+            X, Y = np.meshgrid(x, y)
+            distance = np.sqrt(X**2 + Y**2)
+            self._VIGNETTE_CACHE[(width, height)] = distance
+
+        # Smooth falloff from center (never above 1 since distance >= 0)
+        vignette = distance * np.float32(-intensity)
+        vignette += 1
+        return np.maximum(vignette, 0.7, out=vignette)
@@ -8,6 +8,7 @@ through optimized hashtags, keywords, alt text, and engagement signals.
 import logging
 import os
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from openai import OpenAI
 import httpx
@@ -15,6 +16,10 @@ import httpx
 # Timeout configuration for OpenAI
 OPENAI_TIMEOUT = httpx.Timeout(120.0, connect=30.0)
 
+# Shared workers for the independent OpenAI calls in optimize_content, so
+# they wait on the network together instead of one after another
+EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix='reach-amplify')
+
 
 class ReachAmplify:
     """
@@ -349,13 +354,13 @@ class ReachAmplify:
         """
         self.logger.info(f"Optimizing content for topic: {topic}")
 
-        # Generate all optimizations
-        hashtags = self.generate_hashtags(topic, caption)
-        alt_text = self.generate_alt_text(image_prompt)
+        # Generate all optimizations; the three AI calls don't depend on
+        # each other, so they run concurrently
+        hashtags_future = EXECUTOR.submit(self.generate_hashtags, topic, caption)
+        alt_text_future = EXECUTOR.submit(self.generate_alt_text, image_prompt)
         keywords = self.extract_keywords(topic)
         optimized_caption = self.optimize_caption(caption, keywords)
         tips = self.get_engagement_tips(topic)
-        discovery_score = self._calculate_discovery_score(hashtags, alt_text, optimized_caption)
 
         # AI & SEO Analysis
         seo_analysis = self.get_seo_analysis(optimized_caption, keywords)
@@ -364,6 +369,10 @@ class ReachAmplify:
         # AIO/GEO/AEO Optimization
         aio_data = self.get_aio_optimization(optimized_caption, topic)
 
+        hashtags = hashtags_future.result()
+        alt_text = alt_text_future.result()
+        discovery_score = self._calculate_discovery_score(hashtags, alt_text, optimized_caption)
+
         return {
             "optimized_caption": optimized_caption,
             "hashtags": hashtags,
@@ -1116,11 +1125,17 @@ Make them sound like real people talking, not formal searches."""
         """
         self.logger.info("Running complete AIO/GEO/AEO optimization")
 
+        # The three AI calls are independent, so run them concurrently
+        faq_future = EXECUTOR.submit(self.generate_faq_content, topic, caption)
+        citation_future = EXECUTOR.submit(self.generate_ai_citation_snippet, caption, topic)
+        queries_future = EXECUTOR.submit(self.generate_conversational_queries, topic)
+        entities = self.extract_entities(caption, topic)
+
         return {
-            "faq_content": self.generate_faq_content(topic, caption),
-            "citation_snippet": self.generate_ai_citation_snippet(caption, topic),
-            "entities": self.extract_entities(caption, topic),
-            "conversational_queries": self.generate_conversational_queries(topic),
+            "faq_content": faq_future.result(),
+            "citation_snippet": citation_future.result(),
+            "entities": entities,
+            "conversational_queries": queries_future.result(),
             "optimization_tips": [
                 "Include the FAQ questions naturally in Stories or carousel posts",
                 "Use the citation snippet in your bio link or landing pages",
@@ -1,4 +1,7 @@
 import os
+import time
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 import httpx
 from openai import OpenAI
@@ -7,6 +10,12 @@ from src.utils.logger import setup_logger
 # Longer timeout for cloud deployments (Render free tier can be slow)
 OPENAI_TIMEOUT = httpx.Timeout(120.0, connect=30.0)  # 120 sec total, 30 sec connect
 
+# How long a GPT-4 image prompt is reused for the same topic before asking again
+IMAGE_PROMPT_TTL = 3600  # 1 hour
+
+# Most topics kept in that cache; topics are user text, so it must be bounded
+IMAGE_PROMPT_CACHE_SIZE = 256
+
 
 class TextGenerator:
     """Generates Instagram captions using OpenAI GPT-4."""
@@ -37,6 +46,10 @@ class TextGenerator:
         self.style = style
         self.hashtag_count = hashtag_count
         self.logger = setup_logger("TextGenerator")
+        # LRU of (topic, style_hints) -> (expires_at, prompt); reached from the
+        # request and executor threads, so guarded by a lock
+        self._image_prompt_cache = OrderedDict()
+        self._image_prompt_lock = threading.Lock()
 
     def generate_caption(
         self,
@@ -105,7 +118,13 @@ class TextGenerator:
             self.logger.error(f"Error generating caption: {e}")
             raise
 
-    def generate_image_prompt(self, topic: str, style_hints: str = "", campaign_mode: str = None) -> str:
+    def generate_image_prompt(
+        self,
+        topic: str,
+        style_hints: str = "",
+        campaign_mode: str = None,
+        use_cache: bool = False
+    ) -> str:
         """
         Generate a DALL-E prompt using diverse visual themes.
 
@@ -113,6 +132,8 @@ class TextGenerator:
             topic: The topic for the image
             style_hints: Additional style guidance
             campaign_mode: Optional campaign mode for theme matching
+            use_cache: Reuse a recent GPT-4 fallback scene for the same topic;
+                leave off where callers want a different image each time
 
         Returns:
             Optimized prompt for DALL-E that looks authentic and varied
@@ -135,41 +156,14 @@ class TextGenerator:
 
         # Fallback: Use GPT-4 with improved prompting
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at creating DALL-E prompts for authentic-looking photographs. "
-                                   "Create images that look like real smartphone photos - slightly imperfect, natural lighting, "
-                                   "real-world textures. AVOID: trees, forests, nature paths (overused). "
-                                   "PREFER: urban scenes, hands/connection, cozy interiors, abstract light, community spaces."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Create a DALL-E prompt for: {topic}\n"
-                                   f"Style hints: {style_hints}\n\n"
-                                   "Choose a UNIQUE theme (avoid trees/forests):\n"
-                                   "- Warm bokeh lights at dusk\n"
-                                   "- Hands holding (no faces)\n"
-                                   "- Cozy interior with tea/coffee\n"
-                                   "- Rain on window glass\n"
-                                   "- Empty park bench at dawn\n"
-                                   "- Single flower, minimal composition\n"
-                                   "- Community garden gate\n"
-                                   "- Candle flame in darkness\n"
-                                   "- Rolling hills at golden hour\n"
-                                   "- Old bridge with character\n\n"
-                                   "Make it look REAL: shot on iPhone 14, slight grain, "
-                                   "not perfectly centered, natural imperfections.\n"
-                                   "NO faces, NO text. Return ONLY the prompt."
-                    }
-                ],
-                max_tokens=250,
-                temperature=0.9  # Higher temperature for more variety
-            )
-
-            prompt = response.choices[0].message.content.strip()
+            cache_key = (topic, style_hints)
+            prompt = self._cached_image_prompt(cache_key) if use_cache else None
+            if prompt:
+                self.logger.info("Reusing cached GPT-4 image prompt")
+            else:
+                prompt = self._request_image_prompt(topic, style_hints)
+                if use_cache:
+                    self._cache_image_prompt(cache_key, prompt)
 
             # Add varied authenticity modifiers
             import random
@@ -198,6 +192,70 @@ class TextGenerator:
             ]
             return random.choice(fallbacks)
 
+    def _cached_image_prompt(self, key: tuple) -> Optional[str]:
+        """Return the cached image prompt for key if it hasn't expired."""
+        with self._image_prompt_lock:
+            cached = self._image_prompt_cache.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.monotonic():
+                del self._image_prompt_cache[key]
+                return None
+            self._image_prompt_cache.move_to_end(key)
+            return cached[1]
+
+    def _cache_image_prompt(self, key: tuple, prompt: str):
+        """Store an image prompt, dropping expired and least recently used entries."""
+        now = time.monotonic()
+        with self._image_prompt_lock:
+            cache = self._image_prompt_cache
+            cache[key] = (now + IMAGE_PROMPT_TTL, prompt)
+            cache.move_to_end(key)
+
+            # Expired entries collect at the least recently used end; any
+            # stragglers further in are still bounded by the size cap
+            while cache and next(iter(cache.values()))[0] <= now:
+                cache.popitem(last=False)
+            while len(cache) > IMAGE_PROMPT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _request_image_prompt(self, topic: str, style_hints: str) -> str:
+        """Ask GPT-4 for a DALL-E prompt (used when visual themes are unavailable)."""
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert at creating DALL-E prompts for authentic-looking photographs. "
+                               "Create images that look like real smartphone photos - slightly imperfect, natural lighting, "
+                               "real-world textures. AVOID: trees, forests, nature paths (overused). "
+                               "PREFER: urban scenes, hands/connection, cozy interiors, abstract light, community spaces."
+                },
+                {
+                    "role": "user",
+                    "content": f"Create a DALL-E prompt for: {topic}\n"
+                               f"Style hints: {style_hints}\n\n"
+                               "Choose a UNIQUE theme (avoid trees/forests):\n"
+                               "- Warm bokeh lights at dusk\n"
+                               "- Hands holding (no faces)\n"
+                               "- Cozy interior with tea/coffee\n"
+                               "- Rain on window glass\n"
+                               "- Empty park bench at dawn\n"
+                               "- Single flower, minimal composition\n"
+                               "- Community garden gate\n"
+                               "- Candle flame in darkness\n"
+                               "- Rolling hills at golden hour\n"
+                               "- Old bridge with character\n\n"
+                               "Make it look REAL: shot on iPhone 14, slight grain, "
+                               "not perfectly centered, natural imperfections.\n"
+                               "NO faces, NO text. Return ONLY the prompt."
+                }
+            ],
+            max_tokens=250,
+            temperature=0.9  # Higher temperature for more variety
+        )
+        return response.choices[0].message.content.strip()
+
     def _build_caption_prompt(
         self,
         topic: str,
@@ -139,6 +139,8 @@ import sqlite3
 import threading
 import time as time_module
 
+from src.constants import CHANNEL_DESC
+
 DB_PATH = 'scheduled_posts.db'
 
 
@@ -217,7 +219,13 @@ class WebContentScheduler:
         return due_schedules
 
     def pick_theme(self, schedule_id, theme_mode):
-        """Pick a theme based on the schedule's mode."""
+        """
+        Pick a theme based on the schedule's mode.
+
+        Returns (theme, rotation), where rotation is the (current, next)
+        cursor pair to store once the post is saved ('different' mode only,
+        otherwise None), or (None, None) if the schedule has no themes.
+        """
         conn = self.get_db()
         c = conn.cursor()
 
@@ -226,41 +234,37 @@ class WebContentScheduler:
 
         if not themes:
             conn.close()
-            return None
+            return None, None
 
+        rotation = None
         if theme_mode == 'same':
             theme = themes[0]
         elif theme_mode == 'different':
-            # Count posts made for this schedule to rotate
-            c.execute('SELECT COUNT(*) as cnt FROM posts WHERE schedule_id = ?', (schedule_id,))
-            count = c.fetchone()['cnt']
-            c.execute('SELECT COUNT(*) as cnt FROM pending_posts WHERE schedule_id = ?', (schedule_id,))
-            count += c.fetchone()['cnt']
-            theme = themes[count % len(themes)]
+            # Use the schedule's rotation cursor (shared with manual generation);
+            # process_schedule advances it together with saving the post
+            c.execute('SELECT next_theme_idx FROM schedules WHERE id = ?', (schedule_id,))
+            cursor = c.fetchone()['next_theme_idx']
+            theme = themes[cursor % len(themes)]
+            rotation = (cursor, (cursor + 1) % len(themes))
         else:  # mixed
             theme = random.choice(themes)
 
         conn.close()
-        return theme
+        return theme, rotation
 
     def generate_content(self, theme):
         """Generate caption and image for a theme."""
-        channel_desc = '''We are the Domestic Violence Center of Chester County (DVCCC),
-        providing FREE, CONFIDENTIAL, LIFESAVING services to survivors of domestic violence
-        in Chester County, PA.'''
-
         # Generate caption
-        result = self.text_gen.generate_caption(theme, channel_description=channel_desc)
+        result = self.text_gen.generate_caption(theme, channel_description=CHANNEL_DESC)
         caption = result['caption']
 
         # Generate image
         prompt = self.text_gen.generate_image_prompt(theme)
-        img_result = self.img_gen.generate_image(prompt, size='1024x1024', style='natural')
-        optimized = self.img_gen.optimize_for_instagram(img_result['image_path'])
+        img_result = self.img_gen.generate_image(prompt, size='1024x1024', style='natural', for_instagram=True)
 
         # Upload to hosting
         if self.uploader:
-            image_url = self.uploader.upload(optimized)
+            image_url = self.uploader.upload(img_result['image_path'])
         else:
             image_url = img_result['image_url']
 
@@ -276,7 +280,7 @@ class WebContentScheduler:
         logger.info(f"Processing schedule: {schedule_name} (ID: {schedule_id})")
 
         # Pick theme
-        theme = self.pick_theme(schedule_id, theme_mode)
+        theme, rotation = self.pick_theme(schedule_id, theme_mode)
         if not theme:
             logger.warning(f"No themes configured for schedule {schedule_id}")
             return
@@ -309,6 +313,15 @@ class WebContentScheduler:
                 ''', (schedule_id, theme, caption, image_url, scheduled_for))
                 logger.info("Added to pending review queue")
 
+            if rotation:
+                # Same transaction as the post, so a failed generation never
+                # skips a theme; leave it if a manual generation moved it first
+                cursor, next_cursor = rotation
+                c.execute('''
+                    UPDATE schedules SET next_theme_idx = ?
+                    WHERE id = ? AND next_theme_idx = ?
+                ''', (next_cursor, schedule_id, cursor))
+
             conn.commit()
             conn.close()
 
@@ -99,9 +99,10 @@ class TrendAnalyzer:
             logger.warning(f"Could not analyze engagement: {e}")
             return {"avg_likes": 0, "avg_comments": 0, "top_performing": None}
 
-    def get_content_prompt_context(self) -> str:
-        """Generate context for AI content generation based on trends."""
-        trends = self.get_trending_topics()
+    def get_content_prompt_context(self, trends: Optional[dict] = None) -> str:
+        """Generate context for AI content generation, reusing already fetched trends if given."""
+        if trends is None:
+            trends = self.get_trending_topics()
 
         context = f"""
 Content Theme: {trends['theme']}
@@ -7,12 +7,23 @@ This module provides implementations for various hosting services.
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from src.utils.logger import setup_logger
 
 
 logger = setup_logger("ImageHosting")
 
+# Keep-alive pool per uploader; sized for the app's parallel slideshow uploads
+POOL_MAXSIZE = 8
+
+
+def _make_session() -> requests.Session:
+    """Create an HTTP session that reuses connections across uploads."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE))
+    return session
+
 
 class CloudinaryUploader:
     """Upload images to Cloudinary (recommended for production)."""
@@ -93,6 +104,8 @@ class ImgurUploader:
                 "Get one at: https://api.imgur.com/oauth2/addclient"
             )
 
+        self.session = _make_session()
+
     def upload(self, image_path: str) -> str:
         """
         Upload image to Imgur.
@@ -110,7 +123,7 @@ class ImgurUploader:
 
         headers = {"Authorization": f"Client-ID {self.client_id}"}
 
-        response = requests.post(
+        response = self.session.post(
             url,
             headers=headers,
             files={"image": image_data},
@@ -146,6 +159,8 @@ class ImgBBUploader:
                 "Get one at: https://api.imgbb.com/"
             )
 
+        self.session = _make_session()
+
     def upload(self, image_path: str) -> str:
         """
         Upload image to ImgBB.
@@ -163,7 +178,7 @@ class ImgBBUploader:
         with open(image_path, "rb") as f:
             image_data = base64.b64encode(f.read()).decode("utf-8")
 
-        response = requests.post(
+        response = self.session.post(
             url,
             data={
                 "key": self.api_key,